@@ -487,6 +487,9 @@ clean_temp_files() {
         "$PROJECT_ROOT/*~"
         "$PROJECT_ROOT/.DS_Store"
         "$PROJECT_ROOT/Thumbs.db"
+        "$PROJECT_ROOT/*.yaml.cache"
+        "$PROJECT_ROOT/config/*.yaml.cache"
+        "$PROJECT_ROOT/config/environments/*.yaml.cache"
     )
     
     for pattern in "${temp_patterns[@]}"; do
@@ -557,6 +560,7 @@ clean_blacklist_files() {
     # Blacklist file patterns
     local blacklist_patterns=(
         "$PROJECT_ROOT/blacklist_Node_*.json"
+        "$PROJECT_ROOT/blacklist_Node_*.jsonl"
         "$PROJECT_ROOT/blacklist_*.json"
     )
     
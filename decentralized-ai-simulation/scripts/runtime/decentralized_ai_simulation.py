@@ -34,7 +34,7 @@ logger = get_logger(__name__)
 
 # Security: Define allowed executables and their safe paths
 ALLOWED_STREAMLIT_PATHS = ['streamlit', './venv/bin/streamlit', 'venv/bin/streamlit']
-ALLOWED_FILE_EXTENSIONS = {'.json', '.db'}
+ALLOWED_FILE_EXTENSIONS = {'.json', '.jsonl', '.db'}
 
 def _validate_file_path(file_path: str, allowed_extensions: set = None) -> bool:
     """
@@ -152,12 +152,11 @@ if __name__ == '__main__':
                 # Final state with path validation
                 logger.info("Simulation completed.")
                 ledger = model.ledger
-                entries = ledger.read_ledger()
-                logger.info(f"Shared ledger: {len(entries)} entries")
+                logger.info(f"Shared ledger: {ledger.count_entries()} entries")
 
                 total_threats = 0
                 for i in range(num_agents):
-                    blacklist_file = f"blacklist_Node_{i}.json"
+                    blacklist_file = f"blacklist_Node_{i}.jsonl"
 
                     # Security: Validate file path before operations
                     if not _validate_file_path(blacklist_file, ALLOWED_FILE_EXTENSIONS):
@@ -167,7 +166,7 @@ if __name__ == '__main__':
                     if os.path.exists(blacklist_file):
                         try:
                             with open(blacklist_file, 'r', encoding='utf-8') as f:
-                                bl = json.load(f)
+                                bl = [json.loads(line) for line in f if line.strip()]
                             total_threats += len(bl)
                             logger.info(f"Node {i} blacklist: {len(bl)} signatures")
 
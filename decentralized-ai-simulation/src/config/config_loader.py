@@ -1,28 +1,38 @@
 """Configuration loader for decentralized AI simulation with modern patterns."""
+import hashlib
 import os
+import pickle
 import yaml
-import time
-from typing import Dict, Any, Optional, Union, TypeVar, Generic, Type, List
-from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, Optional, Union, TypeVar, Generic, Type, List, Tuple, get_args, get_origin, get_type_hints
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from pathlib import Path
 import logging
 from functools import lru_cache
 
+# Prefer the libyaml C bindings; both pairs are safe (no arbitrary object construction)
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database configuration settings."""
     path: str = 'ledger.db'
     connection_pool_size: int = 5
     timeout: int = 30
     check_same_thread: bool = False
+    page_size: int = 4096
+    mmap_size: int = 268435456
+    page_cache_size: int = -64000
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationConfig:
     """Simulation configuration settings."""
     default_agents: int = 50
@@ -32,9 +42,10 @@ class SimulationConfig:
     step_delay: float = 0.1
     anomaly_rate: float = 0.05
     use_parallel_threshold: int = 50
+    batch_steps: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """Agent configuration settings."""
     initial_wealth: int = 1
@@ -44,9 +55,10 @@ class AgentConfig:
     blacklist_threshold: int = 50
     trade_probability: float = 0.1
     move_probability: float = 0.5
+    share_model: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration settings."""
     level: str = 'INFO'
@@ -56,7 +68,7 @@ class LoggingConfig:
     format: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamlitConfig:
     """Streamlit UI configuration settings."""
     page_title: str = 'Decentralized AI Simulation'
@@ -73,7 +85,7 @@ class StreamlitConfig:
     cache_ttl: int = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class MonitoringConfig:
     """Monitoring configuration settings."""
     health_check_interval: int = 30
@@ -81,7 +93,7 @@ class MonitoringConfig:
     enable_prometheus: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class APIConfig:
     """API configuration settings."""
     host: str = "0.0.0.0"
@@ -94,7 +106,7 @@ class APIConfig:
     max_concurrent_requests: int = 100
 
 
-@dataclass
+@dataclass(slots=True)
 class RayConfig:
     """Ray configuration settings."""
     enable: bool = True
@@ -110,7 +122,7 @@ class RayConfig:
     ignore_reinit_error: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceConfig:
     """Performance configuration settings."""
     enable_multiprocessing: bool = True
@@ -124,7 +136,7 @@ class PerformanceConfig:
     enable_memory_profiling: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     """Security configuration settings."""
     enable_input_validation: bool = True
@@ -139,7 +151,7 @@ class SecurityConfig:
     enable_csrf_protection: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class DevelopmentConfig:
     """Development configuration settings."""
     debug_mode: bool = False
@@ -151,21 +163,128 @@ class DevelopmentConfig:
     enable_debug_toolbar: bool = False
 
 
-@dataclass
+# Section name -> dataclass, in serialization order
+_SECTION_CLASSES: Dict[str, type] = {
+    'api': APIConfig,
+    'database': DatabaseConfig,
+    'ray': RayConfig,
+    'simulation': SimulationConfig,
+    'agent': AgentConfig,
+    'logging': LoggingConfig,
+    'streamlit': StreamlitConfig,
+    'monitoring': MonitoringConfig,
+    'performance': PerformanceConfig,
+    'security': SecurityConfig,
+    'development': DevelopmentConfig,
+}
+
+
 class AppConfig:
-    """Main application configuration with all sections."""
-    environment: str = 'development'
-    api: APIConfig = field(default_factory=APIConfig)
-    database: DatabaseConfig = field(default_factory=DatabaseConfig)
-    ray: RayConfig = field(default_factory=RayConfig)
-    simulation: SimulationConfig = field(default_factory=SimulationConfig)
-    agent: AgentConfig = field(default_factory=AgentConfig)
-    logging: LoggingConfig = field(default_factory=LoggingConfig)
-    streamlit: StreamlitConfig = field(default_factory=StreamlitConfig)
-    monitoring: MonitoringConfig = field(default_factory=MonitoringConfig)
-    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
-    security: SecurityConfig = field(default_factory=SecurityConfig)
-    development: DevelopmentConfig = field(default_factory=DevelopmentConfig)
+    """
+    Main application configuration with all sections.
+
+    Sections are constructed on first access, so callers that only read one
+    section do not pay for building the others.
+    """
+
+    __slots__ = ('environment',) + tuple(_SECTION_CLASSES)
+
+    environment: str
+    api: APIConfig
+    database: DatabaseConfig
+    ray: RayConfig
+    simulation: SimulationConfig
+    agent: AgentConfig
+    logging: LoggingConfig
+    streamlit: StreamlitConfig
+    monitoring: MonitoringConfig
+    performance: PerformanceConfig
+    security: SecurityConfig
+    development: DevelopmentConfig
+
+    def __init__(self, environment: str = 'development', **sections: Any) -> None:
+        self.environment = environment
+        for section_name, section in sections.items():
+            if section_name not in _SECTION_CLASSES:
+                raise TypeError(f"Unknown configuration section: {section_name}")
+            setattr(self, section_name, section)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached when the slot is still unset
+        section_cls = _SECTION_CLASSES.get(name)
+        if section_cls is None:
+            raise AttributeError(f"'AppConfig' object has no attribute '{name}'")
+        section = section_cls()
+        setattr(self, name, section)
+        return section
+
+    def __repr__(self) -> str:
+        return f"AppConfig(environment={self.environment!r})"
+
+
+def _build_env_keys(config_cls: type, parent_path: Tuple[str, ...] = ()) -> List[Tuple[str, Tuple[str, ...], Any]]:
+    """Walk a config dataclass and list (ENV_VAR, key path, field type) for every leaf field."""
+    env_keys = []
+    for config_field in fields(config_cls):
+        path = parent_path + (config_field.name,)
+        field_type = config_field.type
+        if is_dataclass(field_type):
+            env_keys.extend(_build_env_keys(field_type, path))
+            continue
+        # Optional[X] overrides are converted as X
+        if get_origin(field_type) is Union:
+            non_none = [arg for arg in get_args(field_type) if arg is not type(None)]
+            if len(non_none) == 1:
+                field_type = non_none[0]
+        env_keys.append(('_'.join(path).upper(), path, field_type))
+    return env_keys
+
+
+def _runtime_types(annotation: Any) -> Tuple[type, ...]:
+    """Reduce a field annotation to a tuple of classes usable with isinstance()."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        return tuple(t for arg in get_args(annotation) for t in _runtime_types(arg))
+    if origin is not None:
+        return (origin,)  # e.g. List[str] -> list
+    return (annotation,)
+
+
+# Declared field types per section dataclass, used to validate loaded values
+_FIELD_TYPES: Dict[type, Dict[str, Tuple[type, ...]]] = {
+    section_cls: {name: _runtime_types(hint) for name, hint in get_type_hints(section_cls).items()}
+    for section_cls in _SECTION_CLASSES.values()
+}
+
+
+# Fingerprint of the section dataclasses. Stored in the pickled config cache
+# so a cache written before a schema change is never loaded
+_CONFIG_SCHEMA_KEY: str = hashlib.sha256(repr([
+    (section_name, [(f.name, repr(f.type)) for f in fields(section_cls)])
+    for section_name, section_cls in _SECTION_CLASSES.items()
+]).encode()).hexdigest()
+
+
+# Environment override table; the schema is static so it is computed once
+_ENV_KEYS: List[Tuple[str, Tuple[str, ...], Any]] = [('ENVIRONMENT', ('environment',), str)] + [
+    env_key
+    for section_name, section_cls in _SECTION_CLASSES.items()
+    for env_key in _build_env_keys(section_cls, (section_name,))
+]
+
+# Converters from environment strings to primitive field types
+_ENV_CONVERTERS: Dict[type, Callable[[str], Any]] = {
+    bool: lambda value: value.lower() in ('true', '1', 'yes', 'on'),
+    int: int,
+    float: float,
+    str: str,
+}
+
+# ENV_VAR -> (key path, field type), for a single pass over os.environ
+_ENV_KEY_INDEX: Dict[str, Tuple[Tuple[str, ...], Any]] = {
+    env_var: (key_path, field_type) for env_var, key_path, field_type in _ENV_KEYS
+}
+
 
 class ConfigLoader:
     """Enhanced configuration loader with validation and modern patterns."""
@@ -180,23 +299,121 @@ class ConfigLoader:
         self.config_path: str = config_path
         self.config: AppConfig = AppConfig()
         self._config_cache: Optional[Dict[str, Any]] = None
+        # Bumped whenever the configuration is (re)built; validate_config
+        # reuses its last result while the version is unchanged
+        self._config_version: int = 0
+        self._validated_version: int = -1
+        self._validated_result: bool = False
         self._load_config()
 
     def _load_config(self) -> None:
         """Load and validate configuration with enhanced error handling."""
         try:
-            config_data = self._read_config_file()
-            if config_data:
-                self._validate_and_merge_config(config_data)
-                logger.info(f"Configuration loaded and validated from {self.config_path}")
+            # Start from defaults so keys removed from the file do not linger on reload
+            self.config = AppConfig()
+            self._config_cache = None
+            self._config_version += 1
+
+            # Taken before parsing, so a file changed mid-load is not cached as current
+            source_stamp = self._config_file_stamp()
+            if source_stamp is not None and self._read_config_cache(source_stamp):
+                logger.info(f"Configuration loaded from cache {self._cache_path}")
             else:
-                logger.info("Using default configuration")
-                self._create_and_save_default_config()
+                config_data = self._read_config_file()
+                if config_data:
+                    self._validate_and_merge_config(config_data)
+                    logger.info(f"Configuration loaded and validated from {self.config_path}")
+                    if source_stamp is not None:
+                        self._write_config_cache(source_stamp)
+                else:
+                    logger.info("Using default configuration")
+                    self._create_and_save_default_config()
+
+            # Environment variables take precedence over the file and defaults
+            self._apply_env_overrides()
 
         except Exception as e:
             logger.error(f"Error loading configuration: {e}")
             raise
 
+    @property
+    def _cache_path(self) -> str:
+        """Path of the pickled AppConfig kept next to the YAML file."""
+        return self.config_path + '.cache'
+
+    def _config_file_stamp(self) -> Optional[Tuple[int, int]]:
+        """(mtime in ns, size) of the YAML file, or None if it cannot be stat'ed."""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_config_cache(self, source_stamp: Tuple[int, int]) -> bool:
+        """
+        Load the pickled AppConfig if it was built from this YAML file and schema.
+
+        The cache is used only when its recorded schema key and YAML
+        (mtime, size) stamp both match exactly, and every field of the
+        unpickled sections can be read; anything else falls back to parsing
+        the YAML. The cache holds the file-derived configuration only;
+        environment overrides are applied afterwards on every load.
+
+        Args:
+            source_stamp: Current _config_file_stamp() of the YAML file.
+
+        Returns:
+            True if the configuration was loaded from the cache
+        """
+        try:
+            schema_key, cached_stamp, config = pickle.loads(Path(self._cache_path).read_bytes())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable config cache {self._cache_path}: {e}")
+            return False
+
+        if schema_key != _CONFIG_SCHEMA_KEY or cached_stamp != source_stamp:
+            logger.debug(f"Ignoring stale config cache {self._cache_path}")
+            return False
+        if not isinstance(config, AppConfig):
+            logger.warning(f"Ignoring config cache {self._cache_path}: unexpected content")
+            return False
+
+        try:
+            # Touch every field, so a section missing a slot is caught here
+            # rather than by a later get()
+            for section_name, section_cls in _SECTION_CLASSES.items():
+                section = getattr(config, section_name)
+                if type(section) is not section_cls:
+                    raise TypeError(f"section '{section_name}' is a {type(section).__name__}")
+                for section_field in fields(section_cls):
+                    getattr(section, section_field.name)
+            if not isinstance(config.environment, str):
+                raise TypeError("environment is not a string")
+        except Exception as e:
+            logger.warning(f"Ignoring config cache {self._cache_path}: {e}")
+            return False
+
+        self.config = config
+        return True
+
+    def _write_config_cache(self, source_stamp: Tuple[int, int]) -> None:
+        """Pickle the file-derived configuration next to the YAML file, keyed by schema and file stamp."""
+        try:
+            Path(self._cache_path).write_bytes(
+                pickle.dumps((_CONFIG_SCHEMA_KEY, source_stamp, self.config), protocol=5)
+            )
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(f"Could not write config cache {self._cache_path}: {e}")
+
+    def _invalidate_config_cache(self) -> None:
+        """Remove the pickled configuration so the next load re-parses the YAML file."""
+        try:
+            Path(self._cache_path).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not remove config cache {self._cache_path}: {e}")
+
     def _read_config_file(self) -> Optional[Dict[str, Any]]:
         """Read and parse YAML configuration file."""
         if not Path(self.config_path).exists():
@@ -204,8 +421,8 @@ class ConfigLoader:
             return None
 
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            # Hand libyaml raw bytes so it decodes in C
+            return yaml.load(Path(self.config_path).read_bytes(), Loader=_Loader)
         except yaml.YAMLError as e:
             logger.error(f"YAML parsing error in {self.config_path}: {e}")
             raise
@@ -231,8 +448,8 @@ class ConfigLoader:
             if 'environment' in config_data:
                 self.config.environment = str(config_data['environment'])
 
-            # Apply environment variable overrides
-            self._apply_env_overrides()
+            # Sections changed; drop the cached dictionary view
+            self._config_cache = None
 
         except Exception as e:
             logger.error(f"Configuration validation failed: {e}")
@@ -243,16 +460,19 @@ class ConfigLoader:
         try:
             current_section = getattr(self.config, section_name)
 
+            field_types = _FIELD_TYPES[type(current_section)]
+
             for key, value in section_data.items():
-                if hasattr(current_section, key):
-                    # Validate type matches expected type
-                    expected_type = type(getattr(current_section, key))
-                    if isinstance(value, expected_type):
-                        setattr(current_section, key, value)
-                    else:
-                        logger.warning(f"Type mismatch for {section_name}.{key}: expected {expected_type.__name__}, got {type(value).__name__}")
-                else:
+                expected_types = field_types.get(key)
+                if expected_types is None:
                     logger.warning(f"Unknown configuration key: {section_name}.{key}")
+                # Validate type matches the declared field type
+                elif isinstance(value, expected_types):
+                    setattr(current_section, key, value)
+                    self._config_cache = None
+                else:
+                    expected_names = ' or '.join(t.__name__ for t in expected_types)
+                    logger.warning(f"Type mismatch for {section_name}.{key}: expected {expected_names}, got {type(value).__name__}")
 
         except Exception as e:
             logger.error(f"Error updating config section {section_name}: {e}")
@@ -268,7 +488,7 @@ class ConfigLoader:
             config_dict = self._config_to_dict()
 
             with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(config_dict, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(config_dict, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
 
             logger.info(f"Created default configuration at {self.config_path}")
 
@@ -277,212 +497,17 @@ class ConfigLoader:
             raise
 
     def _config_to_dict(self) -> Dict[str, Any]:
-        """Convert AppConfig dataclass to dictionary for serialization."""
-        return {
-            'environment': self.config.environment,
-            'api': {
-                'host': self.config.api.host,
-                'port': self.config.api.port,
-                'debug': self.config.api.debug,
-                'cors_origins': self.config.api.cors_origins,
-                'cors_methods': self.config.api.cors_methods,
-                'cors_headers': self.config.api.cors_headers,
-                'request_timeout': self.config.api.request_timeout,
-                'max_concurrent_requests': self.config.api.max_concurrent_requests
-            },
-            'database': {
-                'path': self.config.database.path,
-                'connection_pool_size': self.config.database.connection_pool_size,
-                'timeout': self.config.database.timeout,
-                'check_same_thread': self.config.database.check_same_thread
-            },
-            'ray': {
-                'enable': self.config.ray.enable,
-                'address': self.config.ray.address,
-                'num_cpus': self.config.ray.num_cpus,
-                'num_gpus': self.config.ray.num_gpus,
-                'object_store_memory': self.config.ray.object_store_memory,
-                'dashboard_host': self.config.ray.dashboard_host,
-                'dashboard_port': self.config.ray.dashboard_port,
-                'include_dashboard': self.config.ray.include_dashboard,
-                'log_to_driver': self.config.ray.log_to_driver,
-                'logging_level': self.config.ray.logging_level,
-                'ignore_reinit_error': self.config.ray.ignore_reinit_error
-            },
-            'simulation': {
-                'default_agents': self.config.simulation.default_agents,
-                'default_steps': self.config.simulation.default_steps,
-                'grid_width': self.config.simulation.grid_width,
-                'grid_height': self.config.simulation.grid_height,
-                'step_delay': self.config.simulation.step_delay,
-                'anomaly_rate': self.config.simulation.anomaly_rate,
-                'use_parallel_threshold': self.config.simulation.use_parallel_threshold
-            },
-            'agent': {
-                'initial_wealth': self.config.agent.initial_wealth,
-                'initial_trust_score': self.config.agent.initial_trust_score,
-                'trust_increment': self.config.agent.trust_increment,
-                'trust_decrement': self.config.agent.trust_decrement,
-                'blacklist_threshold': self.config.agent.blacklist_threshold,
-                'trade_probability': self.config.agent.trade_probability,
-                'move_probability': self.config.agent.move_probability
-            },
-            'logging': {
-                'level': self.config.logging.level,
-                'file': self.config.logging.file,
-                'max_bytes': self.config.logging.max_bytes,
-                'backup_count': self.config.logging.backup_count,
-                'format': self.config.logging.format
-            },
-            'streamlit': {
-                'page_title': self.config.streamlit.page_title,
-                'layout': self.config.streamlit.layout,
-                'agent_slider_min': self.config.streamlit.agent_slider_min,
-                'agent_slider_max': self.config.streamlit.agent_slider_max,
-                'agent_slider_default': self.config.streamlit.agent_slider_default,
-                'anomaly_slider_min': self.config.streamlit.anomaly_slider_min,
-                'anomaly_slider_max': self.config.streamlit.anomaly_slider_max,
-                'anomaly_slider_default': self.config.streamlit.anomaly_slider_default,
-                'steps_slider_min': self.config.streamlit.steps_slider_min,
-                'steps_slider_max': self.config.streamlit.steps_slider_max,
-                'steps_slider_default': self.config.streamlit.steps_slider_default,
-                'cache_ttl': self.config.streamlit.cache_ttl
-            },
-            'monitoring': {
-                'health_check_interval': self.config.monitoring.health_check_interval,
-                'metrics_port': self.config.monitoring.metrics_port,
-                'enable_prometheus': self.config.monitoring.enable_prometheus
-            },
-            'performance': {
-                'enable_multiprocessing': self.config.performance.enable_multiprocessing,
-                'max_workers': self.config.performance.max_workers,
-                'memory_limit_mb': self.config.performance.memory_limit_mb,
-                'gc_threshold': self.config.performance.gc_threshold,
-                'enable_caching': self.config.performance.enable_caching,
-                'cache_size_mb': self.config.performance.cache_size_mb,
-                'enable_async_processing': self.config.performance.enable_async_processing,
-                'thread_pool_size': self.config.performance.thread_pool_size,
-                'enable_memory_profiling': self.config.performance.enable_memory_profiling
-            },
-            'security': {
-                'enable_input_validation': self.config.security.enable_input_validation,
-                'max_request_size_mb': self.config.security.max_request_size_mb,
-                'rate_limit_requests_per_minute': self.config.security.rate_limit_requests_per_minute,
-                'enable_rate_limiting': self.config.security.enable_rate_limiting,
-                'allowed_hosts': self.config.security.allowed_hosts,
-                'enable_https_redirect': self.config.security.enable_https_redirect,
-                'ssl_cert_file': self.config.security.ssl_cert_file,
-                'ssl_key_file': self.config.security.ssl_key_file,
-                'secret_key': self.config.security.secret_key,
-                'enable_csrf_protection': self.config.security.enable_csrf_protection
-            },
-            'development': {
-                'debug_mode': self.config.development.debug_mode,
-                'enable_profiling': self.config.development.enable_profiling,
-                'log_sql_queries': self.config.development.log_sql_queries,
-                'auto_reload': self.config.development.auto_reload,
-                'enable_hot_reload': self.config.development.enable_hot_reload,
-                'show_tracebacks': self.config.development.show_tracebacks,
-                'enable_debug_toolbar': self.config.development.enable_debug_toolbar
-            }
-        }
-    
-    def _load_config(self) -> None:
-        """Load configuration from YAML file and apply environment overrides."""
-        try:
-            if not os.path.exists(self.config_path):
-                logger.warning("Config file not found, using default configuration")
-                self._create_default_config()
-                return
-            
-            with open(self.config_path, 'r') as f:
-                loaded_config = yaml.safe_load(f)
-            
-            if loaded_config is None:
-                logger.warning("Config file is empty, using default configuration")
-                self._create_default_config()
-                return
-                
-            self.config = loaded_config
-            logger.info(f"Configuration loaded from {self.config_path}")
-            
-            # Apply environment variable overrides
-            self._apply_env_overrides()
-            
-        except yaml.YAMLError as e:
-            logger.error(f"Error parsing YAML config file: {e}")
-            logger.warning("Using default configuration due to YAML error")
-            self._create_default_config()
-        except Exception as e:
-            logger.error(f"Error loading config file: {e}")
-            raise
-    
-    def _create_default_config(self) -> None:
-        """Create default configuration if config file doesn't exist."""
-        default_config = {
-            'environment': 'development',
-            'database': {
-                'path': 'ledger.db',
-                'connection_pool_size': 5,
-                'timeout': 30,
-                'check_same_thread': False
-            },
-            'simulation': {
-                'default_agents': 50,
-                'default_steps': 100,
-                'grid_width': 10,
-                'grid_height': 10,
-                'step_delay': 0.1,
-                'anomaly_rate': 0.05,
-                'use_parallel_threshold': 50
-            },
-            'agent': {
-                'initial_wealth': 1,
-                'initial_trust_score': 100,
-                'trust_increment': 10,
-                'trust_decrement': 20,
-                'blacklist_threshold': 50,
-                'trade_probability': 0.1,
-                'move_probability': 0.5
-            },
-            'logging': {
-                'level': 'INFO',
-                'file': 'simulation.log',
-                'max_bytes': 10485760,
-                'backup_count': 5,
-                'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            },
-            'streamlit': {
-                'page_title': 'Decentralized AI Simulation',
-                'layout': 'wide',
-                'agent_slider_min': 10,
-                'agent_slider_max': 200,
-                'agent_slider_default': 50,
-                'anomaly_slider_min': 0.0,
-                'anomaly_slider_max': 0.1,
-                'anomaly_slider_default': 0.05,
-                'steps_slider_min': 10,
-                'steps_slider_max': 100,
-                'steps_slider_default': 50,
-                'cache_ttl': 5
-            },
-            'monitoring': {
-                'health_check_interval': 30,
-                'metrics_port': 8000,
-                'enable_prometheus': False
-            }
-        }
-        
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        
-        with open(self.config_path, 'w') as f:
-            yaml.dump(default_config, f, default_flow_style=False)
-        
-        logger.info(f"Created default configuration at {self.config_path}")
-        self.config = default_config
-        # Apply environment variable overrides to default config
-        self._apply_env_overrides()
+        """
+        Convert AppConfig dataclass to dictionary for serialization.
+
+        The dictionary is built once and reused until the configuration changes.
+        """
+        if self._config_cache is None:
+            config_dict: Dict[str, Any] = {'environment': self.config.environment}
+            for section_name in _SECTION_CLASSES:
+                config_dict[section_name] = asdict(getattr(self.config, section_name))
+            self._config_cache = config_dict
+        return self._config_cache
     
     def get(self, key: str, default: Optional[Any] = None) -> Any:
         """
@@ -498,22 +523,23 @@ class ConfigLoader:
         Raises:
             KeyError: If key not found and no default provided
         """
-        try:
-            return self._get_nested_value(self._config_to_dict(), key.split('.'))
-        except (KeyError, TypeError):
-            if default is not None:
-                return default
-            raise KeyError(f"Configuration key '{key}' not found")
-
-    def _get_nested_value(self, config_dict: Dict[str, Any], keys: List[str]) -> Any:
-        """Get nested value from dictionary using list of keys."""
-        value = config_dict
-        for key in keys:
-            if isinstance(value, dict):
-                value = value[key]
-            else:
-                raise KeyError(f"Key '{key}' not found in configuration")
-        return value
+        # Keys are 'environment', '<section>' or '<section>.<field>'; only
+        # declared names are resolved, never arbitrary attributes
+        if key == 'environment':
+            return self.config.environment
+        section_name, _, field_name = key.partition('.')
+        section_cls = _SECTION_CLASSES.get(section_name)
+        if section_cls is not None:
+            section = getattr(self.config, section_name)
+            # Whole sections are returned as dictionaries, as before
+            if not field_name:
+                return asdict(section)
+            if field_name in _FIELD_TYPES[section_cls]:
+                return getattr(section, field_name)
+
+        if default is not None:
+            return default
+        raise KeyError(f"Configuration key '{key}' not found")
 
     def get_section(self, section_name: str) -> Dict[str, Any]:
         """
@@ -525,10 +551,9 @@ class ConfigLoader:
         Returns:
             Section configuration as dictionary
         """
-        if hasattr(self.config, section_name):
+        if section_name in _SECTION_CLASSES:
             section = getattr(self.config, section_name)
-            if hasattr(section, '__dict__'):
-                return section.__dict__
+            return {f.name: getattr(section, f.name) for f in fields(section)}
         raise KeyError(f"Configuration section '{section_name}' not found")
 
     def is_production(self) -> bool:
@@ -540,82 +565,75 @@ class ConfigLoader:
         return self.config.environment == 'development'
 
     def _apply_env_overrides(self) -> None:
-        """Apply environment variable overrides with enhanced type conversion."""
-        config_dict = self._config_to_dict()
-
-        for key_path in self._flatten_config(config_dict):
-            env_var = key_path.upper().replace('.', '_')
-
-            if env_var in os.environ:
-                raw_value = os.environ[env_var]
-                converted_value = self._convert_env_value(raw_value, key_path, config_dict)
-
-                if converted_value is not None:
-                    self._set_nested_value(config_dict, key_path.split('.'), converted_value)
-                    logger.info(f"Overridden '{key_path}' from environment variable {env_var}")
-
-        # Update internal config from modified dictionary
-        self._validate_and_merge_config(config_dict)
-
-    def _convert_env_value(self, value: str, key_path: str, config_dict: Dict[str, Any]) -> Any:
-        """Convert environment variable string to appropriate type."""
-        try:
-            # Get current value to determine target type
-            current_value = self._get_nested_value(config_dict, key_path.split('.'))
-
-            if isinstance(current_value, bool):
-                return value.lower() in ('true', '1', 'yes', 'on')
-            elif isinstance(current_value, int):
-                return int(value)
-            elif isinstance(current_value, float):
-                return float(value)
+        """Apply environment variable overrides directly to the loaded configuration."""
+        overridden = False
+
+        # Scan the environment once; usually only a handful of variables apply
+        for env_var, raw_value in os.environ.items():
+            entry = _ENV_KEY_INDEX.get(env_var)
+            if entry is None:
+                continue
+
+            key_path, target_type = entry
+            dotted_key = '.'.join(key_path)
+            converted_value = self._convert_env_value(raw_value, dotted_key, target_type)
+            if converted_value is None:
+                continue
+
+            if len(key_path) == 1:
+                self.config.environment = str(converted_value)
             else:
-                return value  # Keep as string
-
-        except (KeyError, ValueError, TypeError):
-            # Try to infer type if current value not available
+                section_name, key = key_path
+                self._update_config_section(section_name, {key: converted_value})
+            overridden = True
+            logger.info(f"Overridden '{dotted_key}' from environment variable {env_var}")
+
+        if overridden:
+            self._config_cache = None
+            self._config_version += 1
+
+    def _convert_env_value(self, value: str, key_path: str, target_type: Any) -> Any:
+        """Convert environment variable string to the field's declared type."""
+        converter = _ENV_CONVERTERS.get(target_type)
+        if converter is not None:
             try:
-                # Try integer first
-                if '.' not in value:
-                    return int(value)
-                # Try float
-                return float(value)
+                return converter(value)
             except ValueError:
-                # Check for boolean values
-                if value.lower() in ('true', 'false', '1', '0', 'yes', 'no'):
-                    return value.lower() in ('true', '1', 'yes')
-                # Return as string
-                return value
-
-    def _set_nested_value(self, config_dict: Dict[str, Any], keys: List[str], value: Any) -> None:
-        """Set nested value in dictionary using list of keys."""
-        for key in keys[:-1]:
-            if key not in config_dict:
-                config_dict[key] = {}
-            config_dict = config_dict[key]
-
-        config_dict[keys[-1]] = value
-
-    def _flatten_config(self, config: Dict[str, Any], parent_key: str = '', sep: str = '.') -> List[str]:
-        """Flatten nested configuration dictionary into dot-separated keys."""
-        items = []
-        for k, v in config.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-
-            if isinstance(v, dict):
-                items.extend(self._flatten_config(v, new_key, sep=sep))
-            else:
-                items.append(new_key)
+                logger.warning(f"Could not convert environment value for '{key_path}' to {target_type.__name__}")
+                return None
 
-        return items
+        # Try to infer type if the declared type is not a primitive
+        try:
+            # Try integer first
+            if '.' not in value:
+                return int(value)
+            # Try float
+            return float(value)
+        except ValueError:
+            # Check for boolean values
+            if value.lower() in ('true', 'false', '1', '0', 'yes', 'no'):
+                return value.lower() in ('true', '1', 'yes')
+            # Return as string
+            return value
 
     def reload_config(self) -> None:
         """Reload configuration from file."""
         logger.info("Reloading configuration from file")
+        self._config_cache = None
+        self._invalidate_config_cache()
         self._load_config()
 
     def validate_config(self) -> bool:
-        """Validate current configuration."""
+        """Validate current configuration, reusing the result until the configuration changes."""
+        if self._validated_version == self._config_version:
+            return self._validated_result
+
+        self._validated_result = self._check_config()
+        self._validated_version = self._config_version
+        return self._validated_result
+
+    def _check_config(self) -> bool:
+        """Check configuration invariants."""
         try:
             # Basic validation - ensure all sections are properly typed
             required_sections = ['api', 'database', 'ray', 'simulation', 'agent', 'logging', 'streamlit', 'monitoring', 'performance', 'security', 'development']
@@ -648,16 +666,12 @@ class ConfigLoader:
             logger.error(f"Configuration validation failed: {e}")
             return False
 
-# Global configuration instance with enhanced caching
+# Global configuration instance
 _config_loader: Optional[ConfigLoader] = None
-_config_cache: Optional[Dict[str, Any]] = None
-_cache_timestamp: float = 0
-_cache_ttl: float = 300  # 5 minutes
 
 
-@lru_cache(maxsize=128)
 def get_config_loader() -> ConfigLoader:
-    """Get or create global configuration loader instance with caching."""
+    """Get or create global configuration loader instance."""
     global _config_loader
     if _config_loader is None:
         _config_loader = ConfigLoader()
@@ -666,7 +680,10 @@ def get_config_loader() -> ConfigLoader:
 
 def get_config(key: str, default: Optional[Any] = None) -> Any:
     """
-    Get configuration value by key with enhanced caching.
+    Get configuration value by key.
+
+    Values are read straight from the loaded configuration; call
+    reload_global_config() to pick up changes to the file or environment.
 
     Args:
         key: Configuration key with dot notation
@@ -675,45 +692,22 @@ def get_config(key: str, default: Optional[Any] = None) -> Any:
     Returns:
         Configuration value or default
     """
-    global _config_cache, _cache_timestamp
-
-    # Use cached value if still valid
-    if (_config_cache is not None and
-        (time.time() - _cache_timestamp) < _cache_ttl and
-        key in _config_cache):
-        return _config_cache[key]
-
-    # Get fresh value from loader
     try:
-        loader = get_config_loader()
-        value = loader.get(key, default)
-
-        # Update cache
-        if _config_cache is None:
-            _config_cache = {}
-        _config_cache[key] = value
-        _cache_timestamp = time.time()
-
-        return value
-
+        return get_config_loader().get(key, default)
     except Exception as e:
         logger.error(f"Error getting configuration key '{key}': {e}")
         return default
 
 
 def reload_global_config() -> None:
-    """Reload global configuration and clear caches."""
-    global _config_cache, _cache_timestamp, _config_loader
+    """Reload global configuration."""
+    global _config_loader
 
     logger.info("Reloading global configuration")
 
-    # Clear caches
-    _config_cache = None
-    _cache_timestamp = 0
-    get_config_loader.cache_clear()
-
     # Force recreation of loader
     _config_loader = None
+    _build_config_summary.cache_clear()
 
     # Test that new configuration loads correctly
     loader = get_config_loader()
@@ -722,16 +716,29 @@ def reload_global_config() -> None:
 
 
 def get_config_summary() -> Dict[str, Any]:
-    """Get a summary of current configuration for debugging."""
+    """
+    Get a summary of current configuration for debugging.
+
+    Reads a few attributes directly rather than going through the full config
+    dictionary, and reuses the result until the configuration version changes,
+    so it stays cheap when polled (e.g. by a health endpoint).
+    """
     try:
         loader = get_config_loader()
-        return {
-            'environment': loader.config.environment,
-            'database_path': loader.config.database.path,
-            'default_agents': loader.config.simulation.default_agents,
-            'config_file': loader.config_path,
-            'cache_enabled': _config_cache is not None
-        }
+        summary = dict(_build_config_summary(loader, loader._config_version))
+        summary['cache_enabled'] = loader._config_cache is not None
+        return summary
     except Exception as e:
         logger.error(f"Error getting configuration summary: {e}")
-        return {'error': str(e)}
\ No newline at end of file
+        return {'error': str(e)}
+
+
+@lru_cache(maxsize=1)
+def _build_config_summary(loader: ConfigLoader, config_version: int) -> Dict[str, Any]:
+    """Build the summary for one loader and configuration version."""
+    return {
+        'environment': loader.config.environment,
+        'database_path': loader.config.database.path,
+        'default_agents': loader.config.simulation.default_agents,
+        'config_file': loader.config_path
+    }
@@ -4,19 +4,25 @@ from sklearn.ensemble import IsolationForest
 import random
 import time
 import json
-from typing import Any, Dict, List, Tuple, Optional, Union
+from typing import Any, Dict, Iterator, List, Tuple, Optional, Union
 from dataclasses import dataclass, field
 from contextlib import contextmanager
 from functools import lru_cache
 from ..utils.logging_setup import get_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 # Initialize numpy random generator for modern random number generation
 rng = np.random.default_rng(42)  # Use fixed seed for reproducibility
 
 
-@dataclass
+@dataclass(slots=True)
 class AnomalySignature:
     """Data class representing an anomaly signature with validation."""
     timestamp: float
@@ -35,7 +41,7 @@ class AnomalySignature:
             raise ValueError("Node ID cannot be empty")
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Data class representing signature validation results."""
     signature_id: int
@@ -47,7 +53,7 @@ class ValidationResult:
         self.validator_id = f"validation_{self.signature_id}"
 
 
-@dataclass
+@dataclass(slots=True)
 class TrafficData:
     """Data class representing network traffic data."""
     data: np.ndarray
@@ -74,12 +80,18 @@ class AnomalyAgent(Agent):
         """
         super().__init__(model)
         self.node_id: str = f"Node_{self.unique_id}"
-        self.anomaly_model: IsolationForest = IsolationForest(
-            contamination=0.05, random_state=42
-        )
+        self._model_config: Dict[str, Any] = {
+            # max_samples='auto' subsamples min(256, n_samples) rows per tree
+            'n_estimators': 50, 'max_samples': 'auto', 'contamination': 0.05, 'random_state': 42
+        }
+        self.anomaly_model: IsolationForest = IsolationForest(**self._model_config)
+        # Refit only on first use and every _refit_interval detections
+        self._fitted: bool = False
+        self._fit_counter: int = 0
+        self._refit_interval: int = 50
         self.recent_data: List[float] = []
         self.last_seen_id: int = 0
-        self.local_blacklist_file: str = f"blacklist_{self.node_id}.json"
+        self.local_blacklist_file: str = f"blacklist_{self.node_id}.jsonl"
         self.ledger = model.ledger
 
         # Configuration with type hints
@@ -106,8 +118,7 @@ class AnomalyAgent(Agent):
             TrafficData object containing generated data and anomaly information.
         """
         # Generate normal traffic pattern
-        normal_data = rng.normal(100, 20, batch_size)
-        data = normal_data.copy()
+        data = rng.normal(100, 20, batch_size)
 
         # Determine if anomaly should be injected
         should_inject = force_anomaly or random.random() < 0.05
@@ -120,7 +131,7 @@ class AnomalyAgent(Agent):
             logger.info(f"{self.node_id}: Generated traffic with injected anomaly at index {anomaly_idx}")
 
         # Update recent data buffer
-        self.recent_data = data.tolist()[-100:]
+        self.recent_data = data[-100:].tolist()
 
         return TrafficData(
             data=data,
@@ -147,10 +158,13 @@ class AnomalyAgent(Agent):
             logger.warning(f"{self.node_id}: Empty traffic data provided")
             return False, [], np.array([]), [], np.array([])
 
-        # Fit model and get anomaly scores
+        # Fit on first use and then every _refit_interval calls; otherwise score only
         data_reshaped = traffic_data.data.reshape(-1, 1)
-        self.anomaly_model.fit(data_reshaped)
-        scores = self.anomaly_model.decision_function(data_reshaped).flatten()
+        if not self._fitted or self._fit_counter % self._refit_interval == 0:
+            self.anomaly_model.fit(data_reshaped)
+            self._fitted = True
+        self._fit_counter += 1
+        scores = self.anomaly_model.decision_function(data_reshaped)
 
         # Identify anomalies based on threshold
         anomaly_mask = scores < self.anomaly_threshold
@@ -170,7 +184,8 @@ class AnomalyAgent(Agent):
 
     def _generate_anomaly_ips(self, anomaly_indices: np.ndarray) -> List[str]:
         """Generate IP addresses for detected anomalies."""
-        return [f"192.168.1.{random.randint(1, 255)}" for _ in anomaly_indices]
+        octets = rng.integers(1, 256, size=len(anomaly_indices))
+        return [f"192.168.1.{o}" for o in octets.tolist()]
 
     def generate_signature(self, anomaly_data: np.ndarray, anomaly_ips: List[str], anomaly_scores: np.ndarray) -> AnomalySignature:
         """
@@ -264,11 +279,10 @@ class AnomalyAgent(Agent):
                 validations.append(validation_result)
                 logger.info(f"{self.node_id}: Validated signature {entry['id']} as {is_valid}")
 
-            # Update last seen ID if we processed any entries
+            # Update last seen ID if we processed any entries; ids only grow,
+            # so the polled entries already hold the newest one
             if new_entries:
-                all_entries = self.ledger.read_ledger()
-                if all_entries:
-                    self.last_seen_id = max(e.get('id', 0) for e in all_entries)
+                self.last_seen_id = max(self.last_seen_id, max(e['id'] for e in new_entries))
 
             return validations
 
@@ -360,24 +374,17 @@ class AnomalyAgent(Agent):
         return np.mean(packet_sizes) if packet_sizes else None
 
     def _calculate_similarity_optimized(self, recent_mean: float, sig_mean: float) -> bool:
-        """Calculate cosine similarity with optimized computation."""
+        """Compare two traffic means by magnitude ratio.
+
+        Cosine similarity of two 1-element vectors is only ever +1 or -1, so
+        the ratio of the smaller to the larger mean is checked directly.
+        """
         if abs(recent_mean) < 1e-10 or abs(sig_mean) < 1e-10:
             return abs(recent_mean - sig_mean) < 0.1
 
-        # Use more efficient similarity calculation
-        vec1 = np.array([recent_mean])
-        vec2 = np.array([sig_mean])
-
-        # Avoid division by zero and use more stable calculation
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-
-        if norm1 == 0 or norm2 == 0:
-            return False
-
-        cos_sim = dot_product / (norm1 * norm2)
-        return cos_sim > 0.7
+        largest = max(recent_mean, sig_mean)
+        ratio = min(recent_mean, sig_mean) / largest if largest > 0 else 0.0
+        return ratio > 0.7
 
     def _cache_and_return(self, cache_key: str, result: bool) -> bool:
         """Cache result and return it."""
@@ -418,34 +425,36 @@ class AnomalyAgent(Agent):
         logger.info(f"{self.node_id}: Successfully updated model and blacklist")
 
     def _update_blacklist(self, signature: AnomalySignature) -> None:
-        """Update local blacklist file with new signature."""
+        """Append the signature to the local blacklist as one JSON line."""
+        entry = {
+            'timestamp': signature.timestamp,
+            'node_id': signature.node_id,
+            'confidence': signature.confidence,
+            'features': signature.features
+        }
         try:
-            # Load existing blacklist
-            try:
-                with open(self.local_blacklist_file, 'r', encoding='utf-8') as f:
-                    blacklist = json.load(f)
-            except FileNotFoundError:
-                blacklist = []
-            except json.JSONDecodeError as e:
-                logger.warning(f"{self.node_id}: Corrupted blacklist file, creating new one: {e}")
-                blacklist = []
-
-            # Add signature to blacklist
-            blacklist.append({
-                'timestamp': signature.timestamp,
-                'node_id': signature.node_id,
-                'confidence': signature.confidence,
-                'features': signature.features
-            })
-
-            # Write updated blacklist
-            with open(self.local_blacklist_file, 'w', encoding='utf-8') as f:
-                json.dump(blacklist, f, indent=2)
+            if ORJSON_AVAILABLE:
+                line = orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+            else:
+                line = (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+            with open(self.local_blacklist_file, 'ab') as f:
+                f.write(line)
 
         except Exception as e:
             logger.error(f"{self.node_id}: Failed to update blacklist: {e}")
             raise
 
+    def load_blacklist(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over the signatures in the local blacklist, oldest first."""
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        try:
+            with open(self.local_blacklist_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield loads(line)
+        except FileNotFoundError:
+            return
+
     def _retrain_model(self, signature: AnomalySignature) -> None:
         """Retrain the anomaly detection model with new signature data."""
         try:
@@ -461,7 +470,10 @@ class AnomalyAgent(Agent):
                 return
 
             # Combine recent data with new anomaly data
-            combined_data = np.array(self.recent_data + anomaly_sizes)
+            combined_data = np.concatenate((
+                np.asarray(self.recent_data, dtype=np.float64),
+                np.asarray(anomaly_sizes, dtype=np.float64)
+            ))
 
             if len(combined_data) < self.min_data_points:
                 logger.warning(f"{self.node_id}: Insufficient data for model retraining")
@@ -469,6 +481,7 @@ class AnomalyAgent(Agent):
 
             # Retrain model
             self.anomaly_model.fit(combined_data.reshape(-1, 1))
+            self._fitted = True
             logger.debug(f"{self.node_id}: Model retrained with {len(combined_data)} data points")
 
         except Exception as e:
@@ -503,16 +516,10 @@ class AnomalyAgent(Agent):
             # Phase 1: Generate traffic and detect anomalies
             traffic_data = self.generate_traffic()
 
-            if traffic_data.has_anomaly and len(traffic_data.anomaly_indices) > 0:
-                # Extract anomaly data for signature generation
-                anomaly_data = traffic_data.data[traffic_data.anomaly_indices]
-
-                # For now, generate mock IPs and scores for detected anomalies
-                # In a real implementation, this would come from the detection process
-                anomaly_ips = self._generate_anomaly_ips(np.array(traffic_data.anomaly_indices))
-                anomaly_scores = np.random.normal(-0.5, 0.1, len(anomaly_data))
+            has_anomaly, _, anomaly_data, anomaly_ips, anomaly_scores = self.detect_anomaly(traffic_data)
 
-                # Generate and broadcast signature
+            if has_anomaly:
+                # Generate and broadcast signature; confidence comes from the detection scores
                 signature = self.generate_signature(anomaly_data, anomaly_ips, anomaly_scores)
                 self.broadcast_signature(signature)
 
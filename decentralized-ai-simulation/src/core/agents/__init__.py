@@ -8,6 +8,7 @@ from .agent_manager import (
     AnomalyAgent,
     AgentFactory,
     BoundedList,
+    FloatRingBuffer,
     create_optimized_agent_model,
     validate_agent_input
 )
@@ -16,6 +17,7 @@ __all__ = [
     'AnomalyAgent',
     'AgentFactory',
     'BoundedList',
+    'FloatRingBuffer',
     'create_optimized_agent_model',
     'validate_agent_input'
 ]
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Numeric kernels for the per-step agent work.
+
+The ring-buffer update and mean-similarity check run once per agent per step
+on short float64 arrays, and the batched pre-screen runs once per step over
+every agent's traffic. When Numba is installed they are compiled with @njit
+so each call is a single machine-code function instead of a chain of
+interpreter and NumPy dispatches; without Numba the same functions run as
+plain Python/NumPy.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def ring_buffer_write(buf: np.ndarray, head: int, length: int, data: np.ndarray) -> Tuple[int, int, float]:
+    """
+    Copy data into a ring buffer, overwriting the oldest values when full.
+
+    Until the buffer first fills, head equals length; the slots past it hold
+    no values yet.
+
+    Args:
+        buf: Fixed-size float64 buffer.
+        head: Index of the next slot to write.
+        length: Number of valid values currently in the buffer.
+        data: Values to append.
+
+    Returns:
+        The new (head, length) pair and the change in the sum of the valid
+        values, so callers can keep a running mean.
+    """
+    capacity = buf.shape[0]
+    count = data.shape[0]
+    if count >= capacity:
+        removed = buf[:length].sum()
+        buf[:] = data[count - capacity:]
+        return 0, capacity, buf.sum() - removed
+
+    end = head + count
+    if length == capacity:
+        if end <= capacity:
+            removed = buf[head:end].sum()
+        else:
+            removed = buf[head:].sum() + buf[:end - capacity].sum()
+    elif end > capacity:
+        removed = buf[:end - capacity].sum()
+    else:
+        removed = 0.0
+
+    if end <= capacity:
+        buf[head:end] = data
+    else:
+        # Wrap around: fill to the end, then continue from the start
+        first = capacity - head
+        buf[head:] = data[:first]
+        buf[:count - first] = data[first:]
+    return end % capacity, min(length + count, capacity), data.sum() - removed
+
+
+@njit(cache=True)
+def means_similar(recent_mean: float, sig_mean: float) -> bool:
+    """
+    Decide whether two traffic means are similar.
+
+    Returns:
+        True if the means agree in sign and differ by less than 30%, or, when
+        either is zero, differ by less than 0.1.
+    """
+    if recent_mean == 0 or sig_mean == 0:
+        return abs(recent_mean - sig_mean) < 0.1
+    return ((recent_mean > 0) == (sig_mean > 0) and
+            abs(recent_mean - sig_mean) / max(abs(recent_mean), abs(sig_mean)) < 0.3)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def row_peak_zscores(traffic: np.ndarray) -> np.ndarray:
+        """
+        Largest |z-score| in each row of a 2-D traffic array.
+
+        Compiled, each row is read twice (min/max/sum, then squared
+        deviations) with no temporary arrays.
+
+        Args:
+            traffic: (N, batch_size) float64 array.
+
+        Returns:
+            Length-N array of max |x - mean| / std per row; 0.0 where the
+            row has no spread.
+        """
+        rows, cols = traffic.shape
+        peaks = np.empty(rows)
+        for i in range(rows):
+            total = 0.0
+            lo = traffic[i, 0]
+            hi = traffic[i, 0]
+            for j in range(cols):
+                value = traffic[i, j]
+                total += value
+                if value < lo:
+                    lo = value
+                elif value > hi:
+                    hi = value
+            mean = total / cols
+            sq = 0.0
+            for j in range(cols):
+                diff = traffic[i, j] - mean
+                sq += diff * diff
+            std = np.sqrt(sq / cols)
+            peaks[i] = max(hi - mean, mean - lo) / std if std > 0 else 0.0
+        return peaks
+else:
+    def row_peak_zscores(traffic: np.ndarray) -> np.ndarray:
+        """
+        Largest |z-score| in each row of a 2-D traffic array.
+
+        The farthest value from the mean is either the row maximum or the
+        row minimum, so no centered copy of the array is built.
+
+        Args:
+            traffic: (N, batch_size) float64 array.
+
+        Returns:
+            Length-N array of max |x - mean| / std per row; 0.0 where the
+            row has no spread.
+        """
+        mean = traffic.mean(axis=1)
+        peaks = np.maximum(traffic.max(axis=1) - mean, mean - traffic.min(axis=1))
+        std = traffic.std(axis=1)
+        np.divide(peaks, std, out=peaks, where=std > 0)
+        peaks[std == 0] = 0.0
+        return peaks
@@ -1,13 +1,13 @@
 import sqlite3
 import json
-from typing import List, Dict, Any, Optional, Generator, ContextManager
+from typing import List, Dict, Any, Optional, Tuple, Generator, ContextManager
 import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from ..utils.logging_setup import get_logger
 from ..config.config_loader import get_config
 import time
-from functools import lru_cache
+from collections import OrderedDict
 
 logger = get_logger(__name__)
 
@@ -20,19 +20,28 @@ class DatabaseConfig:
     check_same_thread: bool = False
     journal_mode: str = 'WAL'
     synchronous_mode: str = 'NORMAL'
-    cache_size: int = 10000
+    cache_size: int = -64000  # negative: KiB rather than pages
+    mmap_size: int = 268435456
     max_connections: int = 10
 
 
 @dataclass
 class ConnectionPool:
-    """Enhanced connection pool with better resource management."""
+    """Enhanced connection pool with better resource management.
+
+    Each thread keeps its connection in a threading.local, so looking it up
+    takes no lock; the lock only guards registering a new connection and
+    closing them all.
+    """
     config: DatabaseConfig
+    _local: threading.local = None
     _connections: Dict[int, sqlite3.Connection] = None
     _lock: threading.Lock = None
 
     def __post_init__(self) -> None:
         """Initialize the connection pool."""
+        if self._local is None:
+            self._local = threading.local()
         if self._connections is None:
             self._connections = {}
         if self._lock is None:
@@ -40,36 +49,39 @@ class ConnectionPool:
 
     def get_connection(self) -> sqlite3.Connection:
         """Get a database connection with enhanced configuration."""
-        thread_id = threading.get_ident()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            return connection
+
+        # Create new connection with optimized settings
+        connection = sqlite3.connect(
+            self.config.path,
+            timeout=self.config.timeout,
+            check_same_thread=self.config.check_same_thread
+        )
 
+        # Apply performance optimizations
+        connection.execute(f'PRAGMA journal_mode={self.config.journal_mode}')
+        connection.execute(f'PRAGMA synchronous={self.config.synchronous_mode}')
+        connection.execute(f'PRAGMA cache_size={self.config.cache_size}')
+        # Memory-map the database file so page reads avoid read() copies
+        connection.execute(f'PRAGMA mmap_size={self.config.mmap_size}')
+        connection.execute('PRAGMA foreign_keys=ON')
+        connection.execute('PRAGMA temp_store=memory')
+
+        thread_id = threading.get_ident()
+        self._local.connection = connection
         with self._lock:
-            if thread_id not in self._connections:
-                if len(self._connections) >= self.config.max_connections:
-                    # Remove oldest connection if pool is full
-                    oldest_thread = min(self._connections.keys())
-                    self._close_connection(oldest_thread)
-
-                # Create new connection with optimized settings
-                connection = sqlite3.connect(
-                    self.config.path,
-                    timeout=self.config.timeout,
-                    check_same_thread=self.config.check_same_thread
-                )
-
-                # Apply performance optimizations
-                connection.execute(f'PRAGMA journal_mode={self.config.journal_mode}')
-                connection.execute(f'PRAGMA synchronous={self.config.synchronous_mode}')
-                connection.execute(f'PRAGMA cache_size={self.config.cache_size}')
-                connection.execute('PRAGMA foreign_keys=ON')
-                connection.execute('PRAGMA temp_store=memory')
-
-                self._connections[thread_id] = connection
-                logger.debug(f"Created new database connection for thread {thread_id}")
-
-        return self._connections[thread_id]
+            self._connections[thread_id] = connection
+            if len(self._connections) > self.config.max_connections:
+                # Connections belong to live threads, so they are not evicted
+                logger.warning(f"{len(self._connections)} open database connections exceed "
+                               f"max_connections={self.config.max_connections}")
+        logger.debug(f"Created new database connection for thread {thread_id}")
+        return connection
 
     def _close_connection(self, thread_id: int) -> None:
-        """Close connection for specific thread."""
+        """Close connection for specific thread; caller must hold the lock."""
         if thread_id in self._connections:
             try:
                 self._connections[thread_id].close()
@@ -83,6 +95,8 @@ class ConnectionPool:
         with self._lock:
             for thread_id in list(self._connections.keys()):
                 self._close_connection(thread_id)
+            # Other threads' locals still point at their closed connections
+            self._local = threading.local()
             logger.info("Closed all database connections")
 
 
@@ -147,6 +161,12 @@ class DatabaseLedger:
         self._connection_pool = get_connection_pool()
         self._cache_ttl: int = 300  # 5 minutes cache TTL
         self._last_cache_update: float = 0
+        self._entry_cache: Dict[str, Dict[str, Any]] = {}
+        # get_entries_by_node results keyed by (node_id, limit), each stored
+        # with the write version it was read at; bounded LRU
+        self._node_cache: "OrderedDict[Tuple[str, Optional[int]], Tuple[int, List[Dict[str, Any]]]]" = OrderedDict()
+        self._node_cache_size: int = 64
+        self._write_version: int = 0
 
         logger.info(f"Initializing enhanced database ledger at {self.db_file}")
         self._init_db()
@@ -164,8 +184,7 @@ class DatabaseLedger:
                             node_id TEXT NOT NULL,
                             features TEXT NOT NULL,
                             confidence REAL NOT NULL,
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            UNIQUE(timestamp, node_id)
+                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                         )
                     """)
 
@@ -174,9 +193,13 @@ class DatabaseLedger:
                         CREATE INDEX IF NOT EXISTS idx_ledger_timestamp
                         ON ledger(timestamp)
                     """)
+                    # get_entries_by_node filters on node_id and orders by
+                    # timestamp DESC: this index serves both without a sort step
+                    # and covers every selected column except features
+                    conn.execute("DROP INDEX IF EXISTS idx_ledger_node_id")
                     conn.execute("""
-                        CREATE INDEX IF NOT EXISTS idx_ledger_node_id
-                        ON ledger(node_id)
+                        CREATE INDEX IF NOT EXISTS idx_ledger_node_ts
+                        ON ledger(node_id, timestamp DESC, id, confidence)
                     """)
                     conn.execute("""
                         CREATE INDEX IF NOT EXISTS idx_ledger_confidence
@@ -184,6 +207,8 @@ class DatabaseLedger:
                     """)
 
                     conn.commit()
+                    # Refresh planner statistics only where SQLite judges it worthwhile
+                    conn.execute("PRAGMA optimize")
                     logger.info("Enhanced database schema initialized successfully")
 
             except sqlite3.Error as e:
@@ -211,7 +236,7 @@ class DatabaseLedger:
                 with get_db_connection() as conn:
                     cursor = conn.execute(
                         """
-                        INSERT OR REPLACE INTO ledger (timestamp, node_id, features, confidence)
+                        INSERT INTO ledger (timestamp, node_id, features, confidence)
                         VALUES (?, ?, ?, ?)
                         """,
                         (
@@ -383,6 +408,7 @@ class DatabaseLedger:
 
     def _invalidate_cache(self) -> None:
         """Invalidate cached data after write operations."""
+        self._write_version += 1
         self._last_cache_update = 0
         if hasattr(self, '_cached_ledger'):
             self._cached_ledger = None
@@ -451,7 +477,6 @@ class DatabaseLedger:
                 logger.error(f"Failed to get entry by ID {entry_id}: {e}")
                 raise
 
-    @lru_cache(maxsize=32)
     def get_entries_by_node(self, node_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get entries for a specific node with optional limit and caching.
@@ -466,11 +491,13 @@ class DatabaseLedger:
         if not isinstance(node_id, str) or not node_id.strip():
             raise ValueError("node_id must be a non-empty string")
 
-        # Create cache key
-        cache_key = f"{node_id}_{limit}"
-        if cache_key in self._entry_cache:
+        # Serve from cache only if no write happened since the result was read
+        cache_key = (node_id, limit)
+        cached = self._node_cache.get(cache_key)
+        if cached is not None and cached[0] == self._write_version:
+            self._node_cache.move_to_end(cache_key)
             logger.debug(f"Returning cached entries for node {node_id}")
-            return self._entry_cache[cache_key]
+            return cached[1]
 
         with self.lock:
             try:
@@ -507,8 +534,11 @@ class DatabaseLedger:
                             logger.warning(f"Skipping invalid entry {row[0]}: {e}")
                             continue
 
-                    # Cache the result
-                    self._entry_cache[cache_key] = entries
+                    # Cache the result, evicting the least recently used
+                    self._node_cache[cache_key] = (self._write_version, entries)
+                    self._node_cache.move_to_end(cache_key)
+                    if len(self._node_cache) > self._node_cache_size:
+                        self._node_cache.popitem(last=False)
                     logger.debug(f"Retrieved and cached {len(entries)} entries for node {node_id}")
                     return entries
 
@@ -8,6 +8,7 @@ from .ledger_manager import (
     DatabaseLedger,
     BoundedCache,
     get_db_connection,
+    get_db_writer,
     close_db_connection,
     get_connection_stats,
     get_query_stats,
@@ -19,6 +20,7 @@ __all__ = [
     'DatabaseLedger',
     'BoundedCache',
     'get_db_connection',
+    'get_db_writer',
     'close_db_connection',
     'get_connection_stats',
     'get_query_stats',
@@ -13,7 +13,7 @@ SECURITY FIXES APPLIED:
 CRITICAL FIXES APPLIED:
 - Fixed overly restrictive path validation: Now allows legitimate database paths while maintaining security
 - Added support for multiple database extensions (.db, .sqlite, .sqlite3, .test, .tmp)
-- Permits absolute paths in safe directories (/tmp/, /var/tmp/, /data/, /home/, /app/)
+- Permits absolute paths in safe directories (/tmp/, /var/tmp/, /dev/shm/, /data/, /home/, /app/)
 - Maintains protection against path traversal attacks and injection attempts
 - Database tests and operations now work correctly with relaxed but secure validation
 
@@ -22,11 +22,25 @@ All security vulnerabilities have been addressed while maintaining backward comp
 
 import json
 import os
+import queue
+import random
 import sqlite3
 import threading
 import time
 from contextlib import contextmanager
-from typing import List, Dict, Any, Optional, Union
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Tuple, TypeVar, Union
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import with fallback to handle duplicate files
 try:
@@ -39,6 +53,8 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+T = TypeVar('T')
+
 # Connection pool using threading.local for thread-safe connections
 _thread_local = threading.local()
 
@@ -89,16 +105,30 @@ class BoundedCache:
             value: Value to cache
         """
         with self.lock:
-            if key in self.cache:
-                # Update existing key
-                self.access_order.remove(key)
-            elif len(self.cache) >= self.max_size:
-                # Evict least recently used
-                lru_key = self.access_order.pop(0)
-                del self.cache[lru_key]
+            self._put_unlocked(key, value)
 
-            self.cache[key] = value
-            self.access_order.append(key)
+    def put_many(self, items: Iterable[Tuple[str, Any]]) -> None:
+        """Put multiple items in cache under a single lock acquisition.
+
+        Args:
+            items: Iterable of (key, value) pairs to cache
+        """
+        with self.lock:
+            for key, value in items:
+                self._put_unlocked(key, value)
+
+    def _put_unlocked(self, key: str, value: Any) -> None:
+        """Insert or refresh a key with LRU eviction; caller must hold the lock."""
+        if key in self.cache:
+            # Update existing key
+            self.access_order.remove(key)
+        elif len(self.cache) >= self.max_size:
+            # Evict least recently used
+            lru_key = self.access_order.pop(0)
+            del self.cache[lru_key]
+
+        self.cache[key] = value
+        self.access_order.append(key)
 
     def clear(self) -> None:
         """Clear all cache entries."""
@@ -122,11 +152,15 @@ class BoundedCache:
             Estimated memory usage in bytes
         """
         with self.lock:
-            # Rough estimate: key + value sizes + overhead
-            total_size = 0
-            for key, value in self.cache.items():
-                total_size += len(str(key)) + len(str(value))
-            return total_size + len(self.cache) * 64  # Approximate dict overhead
+            return self._estimate_memory_usage()
+
+    def _estimate_memory_usage(self) -> int:
+        """Estimate memory usage in bytes; caller must hold the lock."""
+        # Rough estimate: key + value sizes + overhead
+        total_size = 0
+        for key, value in self.cache.items():
+            total_size += len(str(key)) + len(str(value))
+        return total_size + len(self.cache) * 64  # Approximate dict overhead
 
     def get_stats(self) -> Dict[str, Union[int, float]]:
         """Get cache statistics.
@@ -143,7 +177,7 @@ class BoundedCache:
                 'hits': self._hits,
                 'misses': self._misses,
                 'hit_rate': hit_rate,
-                'memory_usage': self.get_memory_usage()
+                'memory_usage': self._estimate_memory_usage()
             }
 
     def clear_stats(self) -> None:
@@ -153,35 +187,106 @@ class BoundedCache:
             self._misses = 0
 
 def get_db_connection(db_file: str) -> sqlite3.Connection:
-    """Get or create a SQLite connection for the current thread with security validation and monitoring."""
+    """Get or create a SQLite connection for the current thread with security validation and monitoring.
+
+    Connections are pooled per thread and per database file, so a ledger keeps reusing
+    one persistent connection (and SQLite's per-connection prepared statement cache)
+    for its whole lifetime, and ledgers on different files never share a connection.
+    """
     # Security: Validate database file path to prevent path traversal
     if not _validate_db_path(db_file):
         raise ValueError(f"Invalid database path: {db_file}")
 
-    if not hasattr(_thread_local, 'connection'):
-        # Configure SQLite for better performance and security
-        _thread_local.connection = sqlite3.connect(
-            db_file,
-            timeout=get_config('database.timeout', 30),
-            check_same_thread=get_config('database.check_same_thread', False)
-        )
-        # Enable performance optimizations
-        _thread_local.connection.execute('PRAGMA journal_mode=WAL')
-        _thread_local.connection.execute('PRAGMA synchronous=NORMAL')
-        _thread_local.connection.execute('PRAGMA cache_size=10000')
-        _thread_local.connection.execute('PRAGMA temp_store=memory')
-        _thread_local.connection.execute('PRAGMA mmap_size=268435456')  # 256MB memory map
-        # Security: Enable foreign key constraints
-        _thread_local.connection.execute('PRAGMA foreign_keys=ON')
-
-        # Track connection creation
-        _connection_stats['created'] += 1
-        logger.debug(f"Created new database connection for thread {threading.current_thread().ident}")
+    connections = getattr(_thread_local, 'connections', None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+
+    connection = connections.get(db_file)
+    if connection is None:
+        connection = _open_connection(db_file, get_config('database.check_same_thread', False))
+        connections[db_file] = connection
+        logger.debug(f"Created new database connection to {db_file} for thread {threading.current_thread().ident}")
     else:
         _connection_stats['reused'] += 1
-        logger.debug(f"Reusing existing database connection for thread {threading.current_thread().ident}")
+        logger.debug(f"Reusing existing database connection to {db_file} for thread {threading.current_thread().ident}")
+
+    return connection
+
+def _open_connection(db_file: str, check_same_thread: bool) -> sqlite3.Connection:
+    """Open and configure a new SQLite connection and count it in the pool statistics."""
+    # Configure SQLite for better performance and security. The timeout also
+    # installs SQLite's busy handler, so lock waits happen inside SQLite
+    connection = sqlite3.connect(
+        db_file,
+        timeout=get_config('database.timeout', 30),
+        check_same_thread=check_same_thread
+    )
+    # page_size only applies to a database with no content yet, and must
+    # be set before switching to WAL; it is ignored for existing files
+    connection.execute(f"PRAGMA page_size={int(get_config('database.page_size', 4096))}")
+    # Enable performance optimizations
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    # A negative cache_size is in KiB rather than pages
+    connection.execute(f"PRAGMA cache_size={int(get_config('database.page_cache_size', -64000))}")
+    connection.execute('PRAGMA temp_store=memory')
+    # Memory-map the database file so page reads avoid read() copies
+    connection.execute(f"PRAGMA mmap_size={int(get_config('database.mmap_size', 268435456))}")
+    # Security: Enable foreign key constraints
+    connection.execute('PRAGMA foreign_keys=ON')
+
+    # Track connection creation
+    _connection_stats['created'] += 1
+    return connection
+
+# One writer connection per database file, shared by all threads and used only
+# while holding that file's write lock
+_writer_connections: Dict[str, sqlite3.Connection] = {}
+_writer_locks: Dict[str, threading.Lock] = {}
+_writers_lock = threading.Lock()
 
-    return _thread_local.connection
+@contextmanager
+def get_db_writer(db_file: str) -> Iterator[sqlite3.Connection]:
+    """Hold the write lock for a database file and yield its writer connection.
+
+    SQLite admits one writer per database at a time, so every write in the process
+    goes through a single connection per file, whose transaction state, page cache
+    and prepared statements stay warm between writes. The lock also serializes
+    separate ledgers sharing a file. Readers use their per-thread connections from
+    get_db_connection and never wait on it. An in-memory database is private to the
+    connection that created it, so for ':memory:' the calling thread's pooled
+    connection is used as the writer.
+    """
+    # Security: Validate database file path to prevent path traversal
+    if not _validate_db_path(db_file):
+        raise ValueError(f"Invalid database path: {db_file}")
+
+    with _writers_lock:
+        lock = _writer_locks.setdefault(db_file, threading.Lock())
+    with lock:
+        if db_file == ':memory:':
+            yield get_db_connection(db_file)
+            return
+        connection = _writer_connections.get(db_file)
+        if connection is None:
+            connection = _writer_connections[db_file] = _open_connection(db_file, check_same_thread=False)
+            logger.debug(f"Created writer connection to {db_file}")
+        yield connection
+
+def _close_db_writers(db_file: Optional[str] = None) -> None:
+    """Close the writer connection for db_file, or all writer connections if None."""
+    with _writers_lock:
+        paths = [db_file] if db_file is not None else list(_writer_locks)
+        locks = [(path, _writer_locks.get(path)) for path in paths]
+    for path, lock in locks:
+        if lock is None:
+            continue
+        with lock:
+            connection = _writer_connections.pop(path, None)
+        if connection is not None:
+            connection.close()
+            _connection_stats['closed'] += 1
+            logger.debug(f"Closed writer connection to {path}")
 
 def _validate_db_path(db_path: str) -> bool:
     """Validate database path to prevent path traversal attacks while allowing legitimate operations."""
@@ -211,7 +316,7 @@ def _validate_db_path(db_path: str) -> bool:
 
 def _is_safe_absolute_path(path: str) -> bool:
     """Check if absolute path is within safe directories."""
-    safe_dirs = ['/tmp/', '/var/tmp/', '/data/', '/home/', '/app/']
+    safe_dirs = ['/tmp/', '/var/tmp/', '/dev/shm/', '/data/', '/home/', '/app/']
     return any(path.startswith(safe_dir) for safe_dir in safe_dirs)
 
 def _is_safe_relative_path(path: str) -> bool:
@@ -228,13 +333,29 @@ def _is_safe_relative_path(path: str) -> bool:
 
     return True
 
-def close_db_connection() -> None:
-    """Close the database connection for the current thread."""
-    if hasattr(_thread_local, 'connection'):
-        _thread_local.connection.close()
-        delattr(_thread_local, 'connection')
-        _connection_stats['closed'] += 1
-        logger.debug(f"Closed database connection for thread {threading.current_thread().ident}")
+def close_db_connection(db_file: Optional[str] = None) -> None:
+    """Close the current thread's database connection(s) and the shared writer(s).
+
+    Writer connections are reopened on the next write, so closing them from any
+    thread is safe.
+
+    Args:
+        db_file: Close only the connections to this database. If None, closes all of
+            the current thread's connections and every writer connection.
+    """
+    _close_db_writers(db_file)
+
+    connections = getattr(_thread_local, 'connections', None)
+    if not connections:
+        return
+
+    db_files = [db_file] if db_file is not None else list(connections)
+    for path in db_files:
+        connection = connections.pop(path, None)
+        if connection is not None:
+            connection.close()
+            _connection_stats['closed'] += 1
+            logger.debug(f"Closed database connection to {path} for thread {threading.current_thread().ident}")
 
 def get_connection_stats() -> Dict[str, int]:
     """Get database connection pool statistics."""
@@ -334,6 +455,134 @@ def get_db_connection_context(db_file: str):
         pass
 
 
+def _encode_features(features: Any) -> Union[bytes, str]:
+    """Serialize entry features for the ledger: msgpack bytes when available, else JSON text."""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(features)
+    if ORJSON_AVAILABLE:
+        # Stored as text: bytes in the column mean msgpack
+        return orjson.dumps(features).decode()
+    return json.dumps(features)
+
+
+# orjson.JSONDecodeError subclasses ValueError, like json's
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _decode_features(value: Union[bytes, str]) -> Any:
+    """Deserialize a features column value written by either encoding.
+
+    Text values are JSON, as written before msgpack was used or without it
+    installed; bytes values are msgpack.
+
+    Raises:
+        ValueError: If the value cannot be decoded.
+    """
+    if isinstance(value, bytes):
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("msgpack is required to read binary ledger features")
+        return msgpack.unpackb(value)
+    return _json_loads(value)
+
+
+def _row_to_entry(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Build a ledger entry from a (id, timestamp, node_id, features, confidence) row.
+
+    Raises:
+        ValueError: If the row has the wrong shape or its features cannot be decoded.
+    """
+    entry_id, timestamp, node_id, features, confidence = row
+    return {
+        'id': entry_id,
+        'timestamp': timestamp,
+        'node_id': node_id,
+        'features': _decode_features(features),
+        'confidence': confidence
+    }
+
+
+# Opening bracket -> closing bracket of the JSON texts _encode_features writes
+_JSON_CLOSERS = {'[': ']', '{': '}'}
+
+
+def _decode_features_batch(values: List[Union[bytes, str]]) -> List[Any]:
+    """Decode a column of features values in one call instead of one per row.
+
+    msgpack bytes are mapped through unpackb at C level. Without msgpack,
+    the JSON texts are joined into a single array and parsed once. Joining
+    lets malformed texts regroup into other rows' values (e.g. '[1', '2]'
+    parse as one list), so every text must first look like one complete
+    JSON array or object.
+
+    Raises:
+        ValueError, TypeError: If any value does not decode with the batch's encoding.
+    """
+    if MSGPACK_AVAILABLE:
+        return list(map(msgpack.unpackb, values))
+    for value in values:
+        if not (isinstance(value, str) and value[-1:] == _JSON_CLOSERS.get(value[:1])):
+            raise ValueError("features value is not a complete JSON array or object")
+    decoded = _json_loads('[' + ','.join(values) + ']')
+    if len(decoded) != len(values):
+        raise ValueError("features column did not split into one value per row")
+    return decoded
+
+
+def _rows_to_entries(rows: Iterable[Tuple[Any, ...]], source: str) -> Iterator[Dict[str, Any]]:
+    """Convert rows to entries, logging and skipping any that are invalid.
+
+    The features of all rows are decoded as one batch; if that fails (a bad
+    value, or JSON rows written before msgpack was used), the rows are
+    converted one at a time so only the invalid ones are skipped.
+    """
+    rows = list(rows)
+    try:
+        features = _decode_features_batch([row[3] for row in rows])
+        entries = [
+            {
+                'id': entry_id,
+                'timestamp': timestamp,
+                'node_id': node_id,
+                'features': decoded,
+                'confidence': confidence
+            }
+            for (entry_id, timestamp, node_id, _, confidence), decoded in zip(rows, features)
+        ]
+    except (ValueError, TypeError, IndexError):
+        for row in rows:
+            try:
+                yield _row_to_entry(row)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Skipping invalid row in {source}: {e}")
+        return
+    yield from entries
+
+
+# Attempts for a write that keeps failing with SQLITE_BUSY/locked, and the first
+# backoff delay in seconds (doubled per attempt, plus jitter)
+_WRITE_ATTEMPTS = 5
+_WRITE_BACKOFF = 0.01
+
+_REQUIRED_ENTRY_KEYS = frozenset(('timestamp', 'node_id', 'features', 'confidence'))
+_NUMBER_TYPES = (int, float)
+
+
+# Statement texts are module constants so every call passes the identical
+# string and hits the connection's prepared statement cache
+_SQL_INSERT_ENTRY = """
+    INSERT INTO ledger (timestamp, node_id, features, confidence)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_SELECT_ENTRIES = "SELECT id, timestamp, node_id, features, confidence FROM ledger"
+_SQL_NEW_ENTRIES = _SQL_SELECT_ENTRIES + " WHERE id > ? ORDER BY id"
+# Keyset page: each batch is a separate, fully stepped statement, so no read
+# snapshot stays open on the thread's connection between batches
+_SQL_NEW_ENTRIES_PAGE = _SQL_NEW_ENTRIES + " LIMIT ?"
+_NEW_ENTRIES_BATCH = 256
+_SQL_ENTRY_BY_ID = _SQL_SELECT_ENTRIES + " WHERE id = ?"
+_SQL_ENTRY_ID_RANGE = _SQL_SELECT_ENTRIES + " WHERE id BETWEEN ? AND ? ORDER BY id"
+
+
 class DatabaseLedger:
     """
     SQLite-based ledger for storing immutable records of agent states and anomalies.
@@ -342,6 +591,14 @@ class DatabaseLedger:
     Replaces JSON file with SQLite for better concurrency and immutability.
     Uses connection pooling and efficient queries for performance.
     Implements bounded caching to prevent memory leaks.
+
+    Writes go through the file's shared writer connection under its write lock
+    (get_db_writer). Each thread reads through its own pooled connection, and
+    WAL mode lets those readers run concurrently with each other and with the
+    writer, so read methods do not lock.
+
+    Consumers in the same process can subscribe() to receive each committed
+    entry on a queue instead of polling get_new_entries.
     """
 
     def __init__(self, db_file: Optional[str] = None) -> None:
@@ -352,26 +609,24 @@ class DatabaseLedger:
             db_file: Path to the SQLite database file. If None, uses config.
         """
         self.db_file: str = db_file or get_config('database.path', 'ledger.db')
-        self.lock: threading.Lock = threading.Lock()
 
         # Lazy initialization of caches
-        self._cached_ledger = None
         self._entry_cache = None
         self._cache_size = get_config('database.cache_size', 1000)
+        # read_ledger's snapshot of the table. The ledger is append-only, so
+        # it is refreshed by fetching only the rows past _ledger_max_id
+        self._ledger_entries: List[Dict[str, Any]] = []
+        self._ledger_max_id = 0
+        self._ledger_lock = threading.Lock()
+        # Queues fed with every entry committed through this ledger
+        self._subscribers: List[queue.Queue] = []
+        self._subscribers_lock = threading.Lock()
 
         # Lazy initialization of database schema
         self._db_initialized = False
 
         logger.info(f"Initializing database ledger at {self.db_file} with cache size {self._cache_size}")
 
-    @property
-    def cached_ledger(self) -> BoundedCache:
-        """Lazy-loaded ledger cache."""
-        if self._cached_ledger is None:
-            logger.debug("Lazy-loading ledger cache")
-            self._cached_ledger = BoundedCache(max_size=self._cache_size)
-        return self._cached_ledger
-
     @property
     def entry_cache(self) -> BoundedCache:
         """Lazy-loaded entry cache."""
@@ -392,24 +647,23 @@ class DatabaseLedger:
         Initialize the database schema if it doesn't exist.
         Creates the ledger table with appropriate columns.
         """
-        with self.lock:  # Ensure thread-safe initialization
-            try:
-                conn = get_db_connection(self.db_file)
+        try:
+            with get_db_writer(self.db_file) as conn:
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS ledger (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         timestamp REAL NOT NULL,
                         node_id TEXT NOT NULL,
-                        features TEXT NOT NULL,
+                        features BLOB NOT NULL,
                         confidence REAL NOT NULL,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 """)
                 conn.commit()
-                logger.info("Database schema initialized successfully")
-            except sqlite3.Error as e:
-                logger.error(f"Failed to initialize database: {e}")
-                raise
+            logger.info("Database schema initialized successfully")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to initialize database: {e}")
+            raise
 
     def append_entry(self, entry: Dict[str, Any]) -> int:
         """
@@ -429,65 +683,191 @@ class DatabaseLedger:
         self._ensure_db_initialized()
 
         # Input validation
+        self._validate_entry(entry)
+
+        row = self._entry_row(entry)
+        try:
+            entry_id = self._write(lambda conn: conn.execute(_SQL_INSERT_ENTRY, row).lastrowid)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to append entry: {e}")
+            raise
+        # Stored entries never change, so no cache needs invalidating
+        logger.debug(f"Appended entry with ID {entry_id}")
+        if self._subscribers:
+            self._publish([(entry_id, entry)])
+        return entry_id
+
+    def append_entries(self, entries: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Append several entries in one transaction and return their assigned IDs.
+
+        All rows are written with a single executemany and committed once, so
+        bulk ingest costs one journal sync instead of one per entry. Either
+        every entry is stored or, on error, none are.
+
+        Args:
+            entries: The entries to append, each in the format accepted by append_entry.
+
+        Returns:
+            The IDs of the newly inserted entries, in input order.
+
+        Raises:
+            ValueError: If any entry is invalid; nothing is written in that case.
+            sqlite3.Error: If database operation fails.
+        """
+        # Ensure database is initialized before use
+        self._ensure_db_initialized()
+
+        # Validate and serialize everything before touching the database
+        entries = list(entries)
+        for entry in entries:
+            self._validate_entry(entry)
+        rows = [self._entry_row(entry) for entry in entries]
+        if not rows:
+            return []
+
+        def insert_rows(conn: sqlite3.Connection) -> int:
+            conn.executemany(_SQL_INSERT_ENTRY, rows)
+            # The write transaction is held throughout, so the AUTOINCREMENT
+            # IDs of this batch are consecutive and end at last_insert_rowid
+            return conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+        try:
+            last_id = self._write(insert_rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to append {len(rows)} entries: {e}")
+            raise
+        logger.debug(f"Appended {len(rows)} entries ending at ID {last_id}")
+        entry_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+        if self._subscribers:
+            self._publish(zip(entry_ids, entries))
+        return entry_ids
+
+    def subscribe(self) -> queue.Queue:
+        """
+        Register a queue that receives every entry appended through this ledger.
+
+        Entries are put on the queue after their transaction commits, as dicts
+        with the same keys as get_new_entries returns, in ID order per writer.
+        Each entry is built once and shared by all subscribers, so consumers
+        must not modify it. Only writes made through this DatabaseLedger
+        instance are published; use get_new_entries or iter_new_entries to
+        catch up on anything older or written elsewhere.
+
+        The queue is unbounded, so a subscriber that stops draining it should
+        call unsubscribe().
+
+        Returns:
+            The queue new entries will be put on.
+        """
+        subscription: queue.Queue = queue.Queue()
+        with self._subscribers_lock:
+            # Copy-on-write, so _publish can iterate without the lock
+            self._subscribers = self._subscribers + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: queue.Queue) -> None:
+        """Stop publishing new entries to a queue returned by subscribe()."""
+        with self._subscribers_lock:
+            self._subscribers = [q for q in self._subscribers if q is not subscription]
+
+    def _publish(self, appended: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        """Put committed (id, entry) pairs on every subscriber queue."""
+        subscribers = self._subscribers
+        for entry_id, entry in appended:
+            published = {
+                'id': entry_id,
+                'timestamp': entry['timestamp'],
+                'node_id': entry['node_id'],
+                'features': entry['features'],
+                'confidence': entry['confidence']
+            }
+            for subscription in subscribers:
+                subscription.put_nowait(published)
+
+    def _write(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        Run operation on the writer connection and commit, retrying if the database is busy.
+
+        Each attempt either commits or is rolled back before the writer is
+        released. Busy/locked errors are retried up to _WRITE_ATTEMPTS times with
+        exponential backoff and jitter, so contending writers spread out.
+
+        Returns:
+            The value returned by operation.
+
+        Raises:
+            sqlite3.Error: If the write fails with a non-transient error or keeps
+                failing after the last attempt.
+        """
+        for attempt in range(_WRITE_ATTEMPTS):
+            try:
+                with get_db_writer(self.db_file) as conn:
+                    try:
+                        result = operation(conn)
+                        conn.commit()
+                    except sqlite3.Error:
+                        # Roll back while still holding the writer, which other threads share
+                        conn.rollback()
+                        raise
+                return result
+            except sqlite3.OperationalError as e:
+                if not self._is_transient_error(e) or attempt == _WRITE_ATTEMPTS - 1:
+                    raise
+                delay = _WRITE_BACKOFF * (2 ** attempt) + random.uniform(0, _WRITE_BACKOFF)
+                logger.warning(f"Database busy ({e}), retrying in {delay:.3f}s")
+                time.sleep(delay)
+
+    @staticmethod
+    def _is_transient_error(error: sqlite3.Error) -> bool:
+        """Check if error is a lock conflict that is worth retrying."""
+        error_msg = str(error).lower()
+        return 'locked' in error_msg or 'busy' in error_msg
+
+    @staticmethod
+    def _validate_entry(entry: Dict[str, Any]) -> None:
+        """
+        Check that an entry has the required keys and valid values.
+
+        Raises:
+            ValueError: If the entry is invalid.
+        """
         if not isinstance(entry, dict):
             raise ValueError("Entry must be a dictionary")
 
-        required_keys = {'timestamp', 'node_id', 'features', 'confidence'}
-        if not all(key in entry for key in required_keys):
-            raise ValueError(f"Entry must contain keys: {required_keys}")
+        # Set comparison on the key view runs in C
+        if not entry.keys() >= _REQUIRED_ENTRY_KEYS:
+            raise ValueError(f"Entry must contain keys: {set(_REQUIRED_ENTRY_KEYS)}")
 
         # Validate entry data types and values
-        if not isinstance(entry['timestamp'], (int, float)):
+        if not isinstance(entry['timestamp'], _NUMBER_TYPES):
             raise ValueError("timestamp must be a number")
-        if not isinstance(entry['node_id'], str) or not entry['node_id'].strip():
+        node_id = entry['node_id']
+        if not isinstance(node_id, str) or not node_id.strip():
             raise ValueError("node_id must be a non-empty string")
-        if not isinstance(entry['confidence'], (int, float)):
+        confidence = entry['confidence']
+        if not isinstance(confidence, _NUMBER_TYPES):
             raise ValueError("confidence must be a number")
-        if not (0.0 <= entry['confidence'] <= 1.0):
+        if not (0.0 <= confidence <= 1.0):
             raise ValueError("confidence must be between 0.0 and 1.0")
 
-        conn = None
-        try:
-            with self.lock:
-                conn = get_db_connection(self.db_file)
-                cursor = conn.execute(
-                    """
-                    INSERT INTO ledger (timestamp, node_id, features, confidence)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (
-                        entry['timestamp'],
-                        entry['node_id'],
-                        json.dumps(entry['features']),
-                        entry['confidence']
-                    )
-                )
-                conn.commit()
-                entry_id = cursor.lastrowid
-                logger.debug(f"Appended entry with ID {entry_id}")
-                # Invalidate cache after write
-                self._invalidate_cache()
-                return entry_id
-        except sqlite3.Error as e:
-            logger.error(f"Failed to append entry: {e}")
-            # Retry logic for transient errors
-            if 'locked' in str(e).lower():
-                logger.warning("Database locked, retrying...")
-                time.sleep(0.1)
-                return self.append_entry(entry)
-            raise
-        finally:
-            # Ensure connection cleanup on error (though connection pooling will handle this)
-            if conn and hasattr(conn, 'rollback'):
-                try:
-                    conn.rollback()
-                except Exception:
-                    pass  # Ignore rollback errors
+    @staticmethod
+    def _entry_row(entry: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Convert a validated entry into INSERT parameters."""
+        return (
+            entry['timestamp'],
+            entry['node_id'],
+            _encode_features(entry['features']),
+            entry['confidence']
+        )
 
     def read_ledger(self) -> List[Dict[str, Any]]:
         """
         Read all entries from the ledger in chronological order with error handling.
 
+        Entries read earlier are kept, so each call only queries and decodes
+        the rows appended since the previous one.
+
         Returns:
             List of all ledger entries sorted by ID.
 
@@ -497,46 +877,69 @@ class DatabaseLedger:
         # Ensure database is initialized before use
         self._ensure_db_initialized()
 
-        # Use cached result if available (using bounded cache)
-        cache_key = "ledger_all"
-        cached_result = self.cached_ledger.get(cache_key)
-        if cached_result:
-            logger.debug("Returning cached ledger entries")
-            return cached_result
-
-        conn = None
         try:
-            with self.lock:
+            with self._ledger_lock:
                 conn = get_db_connection(self.db_file)
-                cursor = conn.execute(
-                    "SELECT id, timestamp, node_id, features, confidence FROM ledger ORDER BY id"
-                )
-                rows = cursor.fetchall()
-                entries = []
-                for row in rows:
-                    try:
-                        entry = {
-                            'id': row[0],
-                            'timestamp': row[1],
-                            'node_id': row[2],
-                            'features': json.loads(row[3]),
-                            'confidence': row[4]
-                        }
-                        entries.append(entry)
-                    except (json.JSONDecodeError, IndexError, TypeError) as e:
-                        logger.warning(f"Skipping invalid row in ledger: {e}")
-                        continue
-
-                logger.debug(f"Read {len(entries)} entries from ledger")
-                # Cache the result using bounded cache
-                self.cached_ledger.put(cache_key, entries)
-                return entries
+                cursor = conn.execute(_SQL_NEW_ENTRIES, (self._ledger_max_id,))
+                new_entries = list(_rows_to_entries(cursor, "ledger"))
+                if new_entries:
+                    self._ledger_entries.extend(new_entries)
+                    self._ledger_max_id = new_entries[-1]['id']
+
+                logger.debug(f"Read {len(new_entries)} new of {len(self._ledger_entries)} entries from ledger")
+                # Copy so callers never see the snapshot grow under them
+                return list(self._ledger_entries)
         except sqlite3.Error as e:
             logger.error(f"Failed to read ledger: {e}")
             raise
-        finally:
-            # Connection cleanup is handled by the connection pool
-            pass
+
+    def count_entries(self) -> int:
+        """
+        Count the entries in the ledger without materializing any rows.
+
+        Returns:
+            Number of entries currently stored in the ledger.
+
+        Raises:
+            sqlite3.Error: If database operation fails.
+        """
+        # Ensure database is initialized before use
+        self._ensure_db_initialized()
+
+        try:
+            conn = get_db_connection(self.db_file)
+            cursor = conn.execute("SELECT COUNT(*) FROM ledger")
+            return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to count ledger entries: {e}")
+            raise
+
+    def iter_entries(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over ledger entries in chronological order, fetching rows in batches.
+
+        Unlike read_ledger, this keeps at most one batch of rows in memory and
+        bypasses the ledger cache, so peak memory is independent of ledger size.
+        Each batch is a separate keyset query, so entries appended during the
+        iteration are included.
+
+        Args:
+            batch_size: Number of rows fetched per query. Must be positive.
+
+        Yields:
+            Ledger entries sorted by ID.
+
+        Raises:
+            ValueError: If batch_size is invalid.
+            sqlite3.Error: If database operation fails.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f"batch_size must be a positive integer, got: {batch_size}")
+
+        # Ensure database is initialized before use
+        self._ensure_db_initialized()
+
+        yield from self._iter_pages(0, batch_size, "ledger")
 
     def get_new_entries(self, last_seen_id: int) -> List[Dict[str, Any]]:
         """
@@ -557,30 +960,12 @@ class DatabaseLedger:
 
         conn = None
         try:
-            with self.lock:
-                conn = get_db_connection(self.db_file)
-                cursor = conn.execute(
-                    "SELECT id, timestamp, node_id, features, confidence FROM ledger WHERE id > ? ORDER BY id",
-                    (last_seen_id,)
-                )
-                rows = cursor.fetchall()
-                entries = []
-                for row in rows:
-                    try:
-                        entry = {
-                            'id': row[0],
-                            'timestamp': row[1],
-                            'node_id': row[2],
-                            'features': json.loads(row[3]),
-                            'confidence': row[4]
-                        }
-                        entries.append(entry)
-                    except (json.JSONDecodeError, IndexError, TypeError) as e:
-                        logger.warning(f"Skipping invalid row in new entries: {e}")
-                        continue
-
-                logger.debug(f"Retrieved {len(entries)} new entries since ID {last_seen_id}")
-                return entries
+            conn = get_db_connection(self.db_file)
+            cursor = conn.execute(_SQL_NEW_ENTRIES, (last_seen_id,))
+            entries = list(_rows_to_entries(cursor, "new entries"))
+
+            logger.debug(f"Retrieved {len(entries)} new entries since ID {last_seen_id}")
+            return entries
         except sqlite3.Error as e:
             logger.error(f"Failed to get new entries: {e}")
             raise
@@ -588,14 +973,65 @@ class DatabaseLedger:
             # Connection cleanup handled by pool
             pass
 
+    def iter_new_entries(self, last_seen_id: int,
+                         batch_size: int = _NEW_ENTRIES_BATCH) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over entries newer than the last seen ID, fetching rows in batches.
+
+        Rows are fetched and decoded batch_size at a time, so a consumer that
+        stops early never decodes the rest of the backlog. Each batch is a
+        separate keyset query, so a suspended iterator holds no read snapshot.
+
+        Args:
+            last_seen_id: The last seen entry ID. Must be non-negative.
+            batch_size: Number of rows fetched per query. Must be positive.
+
+        Yields:
+            Entries with IDs greater than last_seen_id, sorted by ID.
+
+        Raises:
+            ValueError: If last_seen_id or batch_size is invalid.
+            sqlite3.Error: If database operation fails.
+        """
+        if not isinstance(last_seen_id, int) or last_seen_id < 0:
+            raise ValueError(f"last_seen_id must be a non-negative integer, got: {last_seen_id}")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError(f"batch_size must be a positive integer, got: {batch_size}")
+
+        yield from self._iter_pages(last_seen_id, batch_size, "new entries")
+
+    def _iter_pages(self, last_id: int, batch_size: int, source: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield entries with IDs above last_id, one WHERE id > ? LIMIT ? query per batch.
+
+        Each page is fetched completely before its entries are yielded and the
+        next page restarts after the last ID read, so nothing keeps a statement
+        (and with it a WAL read snapshot) open while the caller holds the
+        iterator.
+        """
+        while True:
+            try:
+                conn = get_db_connection(self.db_file)
+                rows = conn.execute(_SQL_NEW_ENTRIES_PAGE, (last_id, batch_size)).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to iterate {source}: {e}")
+                raise
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield from _rows_to_entries(rows, source)
+            if len(rows) < batch_size:
+                return
+
     def _invalidate_cache(self) -> None:
-        """Invalidate cached data after write operations."""
+        """Drop cached entries and the read_ledger snapshot."""
         # Clear bounded caches to prevent memory leaks
-        if self._cached_ledger is not None:
-            self._cached_ledger.clear()
         if self._entry_cache is not None:
             self._entry_cache.clear()
-        logger.debug("Cache invalidated after write operation")
+        with self._ledger_lock:
+            self._ledger_entries = []
+            self._ledger_max_id = 0
+        logger.debug("Ledger caches cleared")
 
     def get_entry_by_id(self, entry_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -623,32 +1059,22 @@ class DatabaseLedger:
 
         conn = None
         try:
-            with self.lock:
-                conn = get_db_connection(self.db_file)
-                cursor = conn.execute(
-                    "SELECT id, timestamp, node_id, features, confidence FROM ledger WHERE id = ?",
-                    (entry_id,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    try:
-                        entry = {
-                            'id': row[0],
-                            'timestamp': row[1],
-                            'node_id': row[2],
-                            'features': json.loads(row[3]),
-                            'confidence': row[4]
-                        }
-                        logger.debug(f"Retrieved entry with ID {entry_id}")
-                        # Cache the entry using bounded cache
-                        self.entry_cache.put(cache_key, entry)
-                        return entry
-                    except (json.JSONDecodeError, IndexError, TypeError) as e:
-                        logger.warning(f"Invalid entry data for ID {entry_id}: {e}")
-                        return None
-
-                logger.debug(f"Entry with ID {entry_id} not found")
-                return None
+            conn = get_db_connection(self.db_file)
+            cursor = conn.execute(_SQL_ENTRY_BY_ID, (entry_id,))
+            row = cursor.fetchone()
+            if row:
+                try:
+                    entry = _row_to_entry(row)
+                    logger.debug(f"Retrieved entry with ID {entry_id}")
+                    # Cache the entry using bounded cache
+                    self.entry_cache.put(cache_key, entry)
+                    return entry
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Invalid entry data for ID {entry_id}: {e}")
+                    return None
+
+            logger.debug(f"Entry with ID {entry_id} not found")
+            return None
         except sqlite3.Error as e:
             logger.error(f"Failed to get entry by ID {entry_id}: {e}")
             raise
@@ -656,6 +1082,40 @@ class DatabaseLedger:
             # Connection cleanup handled by pool
             pass
 
+    def get_entries_by_id_range(self, start_id: int, end_id: int) -> List[Dict[str, Any]]:
+        """
+        Get all entries whose IDs fall within an inclusive range using a single query.
+
+        Args:
+            start_id: First entry ID of the range. Must be a positive integer.
+            end_id: Last entry ID of the range. Must be an integer >= start_id.
+
+        Returns:
+            List of entries in the range sorted by ID.
+
+        Raises:
+            ValueError: If the range is invalid.
+        """
+        # Input validation to prevent SQL injection
+        if not isinstance(start_id, int) or start_id <= 0:
+            raise ValueError(f"Invalid start_id: {start_id}. Must be a positive integer.")
+        if not isinstance(end_id, int) or end_id < start_id:
+            raise ValueError(f"Invalid end_id: {end_id}. Must be an integer >= start_id.")
+
+        # Ensure database is initialized before use
+        self._ensure_db_initialized()
+
+        try:
+            conn = get_db_connection(self.db_file)
+            cursor = conn.execute(_SQL_ENTRY_ID_RANGE, (start_id, end_id))
+            entries = list(_rows_to_entries(cursor, "ID range"))
+
+            logger.debug(f"Retrieved {len(entries)} entries with IDs {start_id}-{end_id}")
+            return entries
+        except sqlite3.Error as e:
+            logger.error(f"Failed to get entries for ID range {start_id}-{end_id}: {e}")
+            raise
+
     def cleanup(self) -> None:
         """
         Cleanup database connections and caches.
@@ -666,8 +1126,8 @@ class DatabaseLedger:
             # Clear caches
             self._invalidate_cache()
 
-            # Close database connection for current thread
-            close_db_connection()
+            # Close this ledger's database connection for current thread
+            close_db_connection(self.db_file)
 
             logger.info("Database ledger cleanup completed successfully")
         except Exception as e:
@@ -34,16 +34,15 @@ if __name__ == '__main__':
             # Final state
             logger.info("Simulation completed.")
             ledger = model.ledger
-            entries = ledger.read_ledger()
-            logger.info(f"Shared ledger: {len(entries)} entries")
+            logger.info(f"Shared ledger: {ledger.count_entries()} entries")
             
             total_threats = 0
             for i in range(num_agents):
-                blacklist_file = f"blacklist_Node_{i}.json"
+                blacklist_file = f"blacklist_Node_{i}.jsonl"
                 if os.path.exists(blacklist_file):
                     try:
                         with open(blacklist_file, 'r') as f:
-                            bl = json.load(f)
+                            bl = [json.loads(line) for line in f if line.strip()]
                         total_threats += len(bl)
                         logger.info(f"Node {i} blacklist: {len(bl)} signatures")
                         os.remove(blacklist_file)  # Clean up after reporting
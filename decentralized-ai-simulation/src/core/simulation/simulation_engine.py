@@ -18,21 +18,21 @@ import random
 import threading
 import time
 from multiprocessing import Pool
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import ray
 from mesa import Model
 
 # Import from src structure to avoid duplication
 try:
-    from src.core.agents import AnomalyAgent
+    from src.core.agents import AnomalyAgent, AgentFactory
     from src.core.database import DatabaseLedger
     from src.utils.logging_setup import get_logger
     from src.config.config_loader import get_config
     from src.utils.monitoring import get_monitoring
 except ImportError:
     # Fallback to root level imports if src structure not available
-    from src.core.agents import AnomalyAgent
+    from src.core.agents import AnomalyAgent, AgentFactory
     from src.core.database import DatabaseLedger
     from src.utils.logging_setup import get_logger
     from src.config.config_loader import get_config
@@ -120,13 +120,14 @@ class Simulation(Model):
     Uses AgentSet API for agent activation in Mesa 3.0+.
     """
 
-    def __init__(self, num_agents: int = 100, seed=None):
+    def __init__(self, num_agents: int = 100, seed=None, db_file: Optional[str] = None):
         """
         Initialize the simulation model with input validation and proper resource management.
 
         Args:
             num_agents (int): Number of agents in the simulation. Must be positive.
             seed (int, optional): Random seed for reproducibility.
+            db_file (str, optional): Path to the ledger database. If None, uses config.
 
         Raises:
             ValueError: If num_agents is invalid.
@@ -140,9 +141,14 @@ class Simulation(Model):
 
         super().__init__(seed=seed)
         self.num_agents = num_agents
-        self.ledger = DatabaseLedger()
+        self.ledger = DatabaseLedger(db_file)
         self.validations = {}  # Collect validations per signature ID
         self.threshold = num_agents // 2 + 1  # Majority consensus threshold
+        # Let agents score against one class-level forest instead of one each
+        self.share_model = bool(get_config('agent.share_model', False))
+        self.shared_refit_interval = 50  # steps between refits of the shared forest
+        # Step all agents from one traffic draw with a vectorized pre-screen
+        self.batch_steps = bool(get_config('simulation.batch_steps', False))
 
         # Create agents manually and store in list
         self.node_agents = []
@@ -170,6 +176,13 @@ class Simulation(Model):
             if self.use_parallel:
                 logger.info(f"Using Ray for parallel execution with {num_agents} agents")
 
+        # In-process agents share self.ledger, so it pushes each new entry to
+        # them instead of every agent querying for it. Agents shipped to other
+        # processes would not receive the pushes and keep polling
+        if not self.use_parallel:
+            for agent in self.node_agents:
+                agent.attach_ledger_feed()
+
     def agent_step(self, agent):
         """
         Wrapper for agent step to enable parallel execution.
@@ -208,6 +221,10 @@ class Simulation(Model):
             # Phase 3: Resolve consensus and update agents
             self.resolve_consensus(all_validations)
 
+            # Phase 4: Refit the shared forest from the agents' pooled traffic
+            if self.share_model and self.steps % self.shared_refit_interval == 0:
+                AnomalyAgent.refit_shared_model(self.node_agents)
+
             # Record metrics
             step_duration = time.time() - step_start
             self.monitoring.record_metric('step_duration', step_duration)
@@ -233,6 +250,9 @@ class Simulation(Model):
 
         if self.use_parallel:
             self._execute_parallel_steps(execute_single_agent)
+        elif self.batch_steps:
+            random.shuffle(self.node_agents)
+            AgentFactory.step_batch(self.node_agents)
         else:
             self._execute_sequential_steps(execute_single_agent)
 
@@ -419,6 +439,11 @@ class Simulation(Model):
             if hasattr(self, 'use_parallel') and self.use_parallel:
                 _safe_ray_shutdown()
 
+            # Stop pushing ledger entries to agents; they fall back to polling
+            if hasattr(self, 'node_agents'):
+                for agent in self.node_agents:
+                    agent.detach_ledger_feed()
+
             # Cleanup ledger
             if hasattr(self, 'ledger'):
                 self.ledger.cleanup()
@@ -27,6 +27,8 @@ class Monitoring:
         self.metrics = {}
         self.health_checks = {}
         self.start_time = time.time()
+        # Per-metric stats memoized until the metric's values change
+        self._stats_cache: Dict[str, Dict[str, float]] = {}
         
     def record_metric(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
         """Record a metric with optional labels and memory management.
@@ -38,6 +40,7 @@ class Monitoring:
         """
         if name not in self.metrics:
             self.metrics[name] = []
+        self._stats_cache.pop(name, None)
 
         metric_data = {
             'value': value,
@@ -68,20 +71,30 @@ class Monitoring:
         # Trim existing metrics if needed
         if name in self.metrics and len(self.metrics[name]) > max_count:
             self.metrics[name] = self.metrics[name][-max_count:]
+            self._stats_cache.pop(name, None)
     
     def get_metric_stats(self, name: str) -> Dict[str, float]:
-        """Get statistics for a metric."""
+        """Get statistics for a metric.
+
+        Results are memoized per metric and invalidated whenever the metric changes,
+        so repeated lookups between recordings do not rescan the stored values.
+        """
         if name not in self.metrics or not self.metrics[name]:
             return {}
-        
-        values = [m['value'] for m in self.metrics[name]]
-        return {
-            'count': len(values),
-            'min': min(values),
-            'max': max(values),
-            'avg': sum(values) / len(values),
-            'latest': values[-1]
-        }
+
+        stats = self._stats_cache.get(name)
+        if stats is None:
+            values = [m['value'] for m in self.metrics[name]]
+            stats = {
+                'count': len(values),
+                'min': min(values),
+                'max': max(values),
+                'avg': sum(values) / len(values),
+                'latest': values[-1]
+            }
+            self._stats_cache[name] = stats
+        # Return a copy so callers cannot mutate the cached entry
+        return dict(stats)
     
     def register_health_check(self, name: str, check_func) -> None:
         """Register a health check function."""
@@ -167,7 +180,10 @@ class Monitoring:
                 metric for metric in self.metrics[name]
                 if current_time - metric['timestamp'] <= max_age_seconds
             ]
-            total_removed += original_count - len(self.metrics[name])
+            removed = original_count - len(self.metrics[name])
+            if removed:
+                self._stats_cache.pop(name, None)
+            total_removed += removed
 
         return total_removed
     
@@ -205,12 +221,12 @@ def database_health_check() -> HealthStatus:
     from src.core.database import DatabaseLedger
     try:
         db = DatabaseLedger()
-        entries = db.read_ledger()
+        entry_count = db.count_entries()
         return HealthStatus(
             status='healthy',
-            message=f'Database connected with {len(entries)} entries',
+            message=f'Database connected with {entry_count} entries',
             timestamp=time.time(),
-            details={'entry_count': len(entries)}
+            details={'entry_count': entry_count}
         )
     except Exception as e:
         return HealthStatus(
@@ -5,7 +5,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import pytest
 import numpy as np
 from unittest.mock import Mock, patch
-from src.core.agents import AnomalyAgent
+from src.core.agents import AnomalyAgent, AgentFactory, BoundedList, FloatRingBuffer
 from sklearn.ensemble import IsolationForest
 import random
 import time
@@ -35,7 +35,7 @@ def test_anomaly_agent_init(mock_model, mock_ledger):
     assert isinstance(agent.anomaly_model, IsolationForest)
     assert agent.recent_data == []
     assert agent.last_seen_id == 0
-    assert agent.local_blacklist_file == f"blacklist_{agent.node_id}.json"
+    assert agent.local_blacklist_file == f"blacklist_{agent.node_id}.jsonl"
     assert agent.ledger == mock_ledger
     assert agent.model is mock_model
 
@@ -91,6 +91,64 @@ def test_detect_anomaly_with_anomaly(mock_model, mock_ledger):
     assert len(anomaly_data) == len(indices)
     assert np.any(anomaly_data > 400)  # Outlier detected
 
+def test_detect_anomaly_reuses_fitted_model(mock_model, mock_ledger):
+    """Test the forest is fitted once and only rescored until the refit interval."""
+    mock_model.ledger = mock_ledger
+    agent = AnomalyAgent(mock_model)
+    data = rng.normal(100, 20, 100)
+
+    agent.detect_anomaly(data)
+    with patch.object(agent.anomaly_model, 'fit') as mock_fit:
+        for _ in range(agent._refit_interval - 1):
+            agent.detect_anomaly(data)
+        mock_fit.assert_not_called()
+
+        agent.detect_anomaly(data)
+        mock_fit.assert_called_once()
+
+def test_shared_model_pool(mock_model, mock_ledger, tmp_path):
+    """Test agents of a share_model simulation score against one class-level forest."""
+    mock_model.ledger = mock_ledger
+    mock_model.share_model = True
+    AnomalyAgent.reset_shared_model()
+    try:
+        first, second = AnomalyAgent(mock_model), AnomalyAgent(mock_model)
+        data = rng.normal(100, 20, 100)
+
+        first.recent_data = data
+        first.detect_anomaly(data)
+        fitted = first.anomaly_model
+        assert second.anomaly_model is fitted
+        second.detect_anomaly(data)
+        assert AnomalyAgent._shared_model is fitted  # agents never refit it themselves
+
+        assert AnomalyAgent.refit_shared_model([first, second])
+        assert AnomalyAgent._shared_model is not fitted
+
+        refitted = AnomalyAgent._shared_model
+        first.local_blacklist_file = str(tmp_path / "blacklist.jsonl")
+        first.update_model_and_blacklist({'packet_sizes': [500.0], 'features': []})
+        assert first.anomaly_model is refitted  # folded into the pool, not fitted
+        assert first.recent_data[-1] == 500.0
+    finally:
+        AnomalyAgent.reset_shared_model()
+
+def test_recent_data_ring_buffer_wraps(mock_model, mock_ledger):
+    """Test recent traffic keeps the newest values in order once the buffer wraps."""
+    mock_model.ledger = mock_ledger
+    agent = AnomalyAgent(mock_model)
+    capacity = agent._recent.max_size
+
+    agent.recent_data = np.arange(capacity - 5, dtype=np.float64)
+    agent.generate_traffic(batch_size=10)
+    newest = agent.generate_traffic(batch_size=3)
+
+    recent = agent.recent_data
+    assert len(recent) == capacity
+    assert recent[-3:] == newest.tolist()
+    assert recent[0] == 8.0  # the 8 oldest values were overwritten
+    assert agent._recent.mean() == pytest.approx(np.mean(recent))
+
 def test_generate_signature(mock_model, mock_ledger):
     """Test signature generation."""
     mock_model.ledger = mock_ledger
@@ -104,6 +162,7 @@ def test_generate_signature(mock_model, mock_ledger):
     assert 'timestamp' in sig
     assert 'features' in sig
     assert len(sig['features']) == 1
+    assert sig['packet_sizes'] == [500.0]
     assert 'confidence' in sig
     assert sig['node_id'] == agent.node_id
 
@@ -139,6 +198,62 @@ def test_validate_signature_false(mock_model, mock_ledger):
     
     assert not valid  # Random failure return False
 
+def test_calculate_similarity():
+    """Test mean comparison used for signature validation."""
+    assert AnomalyAgent._calculate_similarity_optimized(100.0, 110.0)
+    assert not AnomalyAgent._calculate_similarity_optimized(100.0, 500.0)
+    assert not AnomalyAgent._calculate_similarity_optimized(100.0, -100.0)
+    assert AnomalyAgent._calculate_similarity_optimized(0.0, 0.05)
+
+def test_poll_and_validate_tracks_last_seen_id(mock_model, mock_ledger):
+    """Test that polling advances last_seen_id from the new entries alone."""
+    mock_model.ledger = mock_ledger
+    agent = AnomalyAgent(mock_model)
+    mock_ledger.get_new_entries.return_value = [
+        {'id': 3, 'node_id': agent.node_id, 'features': [{'packet_size': 100.0}]},
+        {'id': 7, 'node_id': agent.node_id, 'features': [{'packet_size': 100.0}]},
+    ]
+
+    assert agent.poll_and_validate() == []
+    assert agent.last_seen_id == 7
+    mock_ledger.read_ledger.assert_not_called()
+
+def test_poll_and_validate_skips_seen_ids(mock_model, mock_ledger):
+    """Test that a signature delivered twice is only validated once."""
+    mock_model.ledger = mock_ledger
+    agent = AnomalyAgent(mock_model)
+    entry = {'id': 4, 'node_id': 'Node_other', 'features': [{'packet_size': 100.0}]}
+    mock_ledger.get_new_entries.return_value = [entry]
+
+    with patch.object(agent, 'validate_signature', return_value=True) as mock_validate:
+        assert agent.poll_and_validate() == [{'sig_id': 4, 'valid': True}]
+        assert agent.poll_and_validate() == []
+    mock_validate.assert_called_once_with(entry)
+
+def test_poll_and_validate_reads_ledger_feed(mock_model, mock_ledger):
+    """Test an attached agent catches up once, then takes entries from its subscription."""
+    import queue
+    mock_model.ledger = mock_ledger
+    feed = queue.Queue()
+    mock_ledger.subscribe.return_value = feed
+    agent = AnomalyAgent(mock_model)
+    agent.attach_ledger_feed()
+
+    backlog = [{'id': 1, 'node_id': agent.node_id, 'features': [{'packet_size': 100.0}]},
+               {'id': 2, 'node_id': agent.node_id, 'features': [{'packet_size': 100.0}]}]
+    mock_ledger.get_new_entries.return_value = backlog
+    feed.put(backlog[1])
+    assert agent.poll_and_validate() == []
+    assert agent.last_seen_id == 2
+
+    feed.put({'id': 3, 'node_id': agent.node_id, 'features': [{'packet_size': 100.0}]})
+    assert agent.poll_and_validate() == []
+    assert agent.last_seen_id == 3
+    mock_ledger.get_new_entries.assert_called_once_with(0)
+
+    agent.detach_ledger_feed()
+    mock_ledger.unsubscribe.assert_called_once_with(feed)
+
 @patch('agents.time.strftime')
 @patch('agents.print')
 def test_step(mock_print, mock_strftime, mock_model, mock_ledger):
@@ -174,9 +289,79 @@ def test_update_model_and_blacklist(mock_model, mock_ledger):
                     agent.update_model_and_blacklist(sig)
         
         # Check file written
-        m_open.assert_called_with(agent.local_blacklist_file, 'w')
+        m_open.assert_called_with(agent.local_blacklist_file, 'a', encoding='utf-8')
     
     # Check model retrained
     train_data = np.array(agent.recent_data + [500]).reshape(-1, 1)
     if len(train_data) > 0:
-        agent.anomaly_model.fit(train_data)
\ No newline at end of file
+        agent.anomaly_model.fit(train_data)
+
+def test_blacklist_appends_json_lines(mock_model, mock_ledger, tmp_path):
+    """Test confirmed signatures are appended one per line and read back in order."""
+    mock_model.ledger = mock_ledger
+    agent = AnomalyAgent(mock_model)
+    agent.local_blacklist_file = str(tmp_path / "blacklist.jsonl")
+
+    for size in (500.0, 600.0):
+        agent.update_model_and_blacklist({'features': [{'packet_size': size, 'source_ip': '192.168.1.1'}]})
+
+    with open(agent.local_blacklist_file) as f:
+        assert len(f.readlines()) == 2
+    sizes = [sig['features'][0]['packet_size'] for sig in agent.load_blacklist()]
+    assert sizes == [500.0, 600.0]
+
+def test_bounded_list_extend():
+    """Test bulk extend keeps only the newest items and counts all appends."""
+    bounded = BoundedList(max_size=3)
+    bounded.extend([1, 2, 3, 4, 5])
+
+    assert bounded.tolist() == [3, 4, 5]
+    stats = bounded.get_stats()
+    assert stats['current_size'] == 3
+    assert stats['total_appended'] == 5
+    assert stats['memory_usage'] == 3 * 28 + 64
+    array = bounded.to_ndarray()
+    assert array.dtype == np.float64
+    assert array.tolist() == [3.0, 4.0, 5.0]
+
+def test_float_ring_buffer():
+    """Test the ring buffer keeps the newest values oldest-first with a running mean."""
+    buf = FloatRingBuffer(max_size=4)
+    assert buf.mean() == 0.0
+
+    buf.extend(np.array([1.0, 2.0, 3.0]))
+    buf.extend(np.array([4.0, 5.0, 6.0]))
+
+    assert len(buf) == 4
+    assert buf.tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert buf.mean() == pytest.approx(4.5)
+    assert buf.get_memory_usage() == 4 * 8
+    buf.clear()
+    assert len(buf) == 0 and buf.tolist() == []
+
+def test_step_batch_screens_traffic(mock_model, mock_ledger):
+    """Test batched stepping records traffic for every agent and only runs flagged rows."""
+    mock_model.ledger = mock_ledger
+    agents = [AnomalyAgent(mock_model) for _ in range(20)]
+
+    with patch.object(AnomalyAgent, 'act_on_traffic') as mock_act:
+        flagged = AgentFactory.step_batch(agents, batch_size=50)
+
+    assert all(len(agent.recent_data) == 50 for agent in agents)
+    assert mock_act.call_count == flagged
+    assert mock_ledger.get_new_entries.call_count == len(agents)
+
+def test_row_peak_zscores():
+    """Test the pre-screen kernel matches the per-row max |z-score|."""
+    from src.core.agents.kernels import row_peak_zscores
+    traffic = np.random.default_rng(0).normal(100, 20, (5, 50))
+    traffic[2, 7] = 500
+    traffic[4] = 100.0
+
+    expected = np.abs(traffic - traffic.mean(axis=1, keepdims=True)).max(axis=1)
+    expected[:4] /= traffic[:4].std(axis=1)
+    expected[4] = 0.0
+
+    peaks = row_peak_zscores(traffic)
+    np.testing.assert_allclose(peaks, expected)
+    assert peaks.argmax() == 2
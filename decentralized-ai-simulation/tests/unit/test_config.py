@@ -3,7 +3,9 @@
 
 import os
 import tempfile
-from src.config.config_loader import ConfigLoader
+
+import pytest
+from src.config.config_loader import AppConfig, ConfigLoader
 
 def test_config_loading():
     # Test with existing config
@@ -18,12 +20,11 @@ def test_config_loading():
         tmp_path = tmp.name
     try:
         config_loader = ConfigLoader(config_path=tmp_path)
-        print("Config keys:", list(config_loader.config.keys()))
+        print("Database keys:", list(config_loader.get_section('database')))
         print(f"Environment: {config_loader.get('environment')}")
         print(f"Database path: {config_loader.get('database.path')}")
     except Exception as e:
         print("Error:", e)
-        print("Config keys:", list(config_loader.config.keys()))
         raise
     finally:
         os.unlink(tmp_path)
@@ -32,5 +33,98 @@ def test_config_loading():
     print(f"\nIs production: {config_loader.is_production()}")
     print(f"Is development: {config_loader.is_development()}")
 
+def test_config_is_dataclass_tree():
+    with tempfile.NamedTemporaryFile(suffix='.yaml', delete=False) as tmp:
+        tmp.write(b"database:\n  timeout: 45\n")
+        tmp_path = tmp.name
+    try:
+        config_loader = ConfigLoader(config_path=tmp_path)
+        assert isinstance(config_loader.config, AppConfig)
+        assert config_loader.config.database.timeout == 45
+        assert config_loader.get('database.timeout') == 45
+    finally:
+        os.unlink(tmp_path)
+        if os.path.exists(tmp_path + '.cache'):
+            os.unlink(tmp_path + '.cache')
+
+def test_config_cache_reused_with_env_overrides():
+    with tempfile.NamedTemporaryFile(suffix='.yaml', delete=False) as tmp:
+        tmp.write(b"database:\n  timeout: 45\n")
+        tmp_path = tmp.name
+    cache_path = tmp_path + '.cache'
+    try:
+        ConfigLoader(config_path=tmp_path)
+        assert os.path.exists(cache_path)
+
+        # A warm load comes from the cache but still honours the environment
+        os.environ['DATABASE_TIMEOUT'] = '12'
+        try:
+            config_loader = ConfigLoader(config_path=tmp_path)
+            assert config_loader.get('database.timeout') == 12
+        finally:
+            del os.environ['DATABASE_TIMEOUT']
+
+        assert ConfigLoader(config_path=tmp_path).get('database.timeout') == 45
+    finally:
+        os.unlink(tmp_path)
+        if os.path.exists(cache_path):
+            os.unlink(cache_path)
+
+def test_config_get_resolves_declared_keys_only():
+    with tempfile.NamedTemporaryFile(suffix='.yaml', delete=False) as tmp:
+        tmp.write(b"database:\n  timeout: 45\n")
+        tmp_path = tmp.name
+    try:
+        config_loader = ConfigLoader(config_path=tmp_path)
+        assert config_loader.get('database.timeout') == 45
+        assert config_loader.get('database')['timeout'] == 45
+        assert isinstance(config_loader.get('environment'), str)
+        for key in ('database.path.upper', 'environment.__class__', 'database.timeout.real',
+                    'database.__slots__', '__class__', 'database.missing'):
+            with pytest.raises(KeyError):
+                config_loader.get(key)
+            assert config_loader.get(key, 'fallback') == 'fallback'
+    finally:
+        os.unlink(tmp_path)
+        if os.path.exists(tmp_path + '.cache'):
+            os.unlink(tmp_path + '.cache')
+
+def test_config_cache_rejected_when_stale():
+    import pickle
+    from src.config import config_loader as config_module
+
+    with tempfile.NamedTemporaryFile(suffix='.yaml', delete=False) as tmp:
+        tmp.write(b"database:\n  timeout: 45\n")
+        tmp_path = tmp.name
+    cache_path = tmp_path + '.cache'
+    try:
+        ConfigLoader(config_path=tmp_path)
+        stat = os.stat(tmp_path)
+
+        # Replaced with an older file of a different size, as `cp -p` would do
+        with open(tmp_path, 'wb') as f:
+            f.write(b"database:\n  timeout: 7\n  path: other.db\n")
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        assert ConfigLoader(config_path=tmp_path).get('database.timeout') == 7
+
+        # A cache written under another schema is ignored
+        _, stamp, config = pickle.loads(open(cache_path, 'rb').read())
+        config.database.timeout = 99
+        with open(cache_path, 'wb') as f:
+            pickle.dump(('old-schema', stamp, config), f)
+        assert ConfigLoader(config_path=tmp_path).get('database.timeout') == 7
+
+        # So is one whose sections are missing fields
+        bare_section = object.__new__(config_module.DatabaseConfig)
+        with open(cache_path, 'wb') as f:
+            pickle.dump((config_module._CONFIG_SCHEMA_KEY, stamp, AppConfig(database=bare_section)), f)
+        config_loader = ConfigLoader(config_path=tmp_path)
+        assert config_loader.get('database.timeout') == 7
+        assert config_loader.get('database')['path'] == 'other.db'
+    finally:
+        os.unlink(tmp_path)
+        if os.path.exists(cache_path):
+            os.unlink(cache_path)
+
 if __name__ == '__main__':
     test_config_loading()
\ No newline at end of file
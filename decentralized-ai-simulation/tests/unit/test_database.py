@@ -1,7 +1,7 @@
 import pytest
 import tempfile
 import os
-from src.core.database import DatabaseLedger
+from src.core.database import DatabaseLedger, BoundedCache
 
 @pytest.fixture
 def temp_db():
@@ -110,4 +110,321 @@ def test_thread_safety_append(temp_db):
         t.join()
     
     read_entries = ledger.read_ledger()
-    assert len(read_entries) == 2  # Both inserted without corruption
\ No newline at end of file
+    assert len(read_entries) == 2  # Both inserted without corruption
+
+
+def test_count_entries(temp_db):
+    """Test counting entries without reading them."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    assert ledger.count_entries() == 0
+
+    for i in range(3):
+        ledger.append_entry({'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [], 'confidence': 0.5})
+
+    assert ledger.count_entries() == 3
+
+
+def test_iter_entries(temp_db):
+    """Test iterating entries in batches returns all rows in order."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    ids = [
+        ledger.append_entry({'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [i], 'confidence': 0.5})
+        for i in range(5)
+    ]
+
+    entries = list(ledger.iter_entries(batch_size=2))
+
+    assert [e['id'] for e in entries] == ids
+    assert entries[4]['features'] == [4]
+
+    with pytest.raises(ValueError):
+        list(ledger.iter_entries(batch_size=0))
+
+
+def test_bounded_cache_put_many():
+    """Test bulk insert evicts least recently used entries."""
+    cache = BoundedCache(max_size=2)
+    cache.put_many([('a', 1), ('b', 2), ('c', 3)])
+
+    assert cache.size() == 2
+    assert cache.get('a') is None
+    assert cache.get('c') == 3
+    assert cache.get_stats()['size'] == 2
+
+
+def test_ledger_reuses_single_connection(temp_db):
+    """Test a ledger opens one persistent writer and one reader connection for all of its operations."""
+    from src.core.database import get_connection_stats
+    created_before = get_connection_stats()['created']
+
+    ledger = DatabaseLedger(db_file=temp_db)
+    for i in range(10):
+        ledger.append_entry({'timestamp': float(i), 'node_id': 'Node_1', 'features': [], 'confidence': 0.5})
+    for i in range(10):
+        ledger.get_entry_by_id(i + 1)
+
+    assert get_connection_stats()['created'] - created_before == 2
+
+
+def test_connections_are_per_database(temp_db):
+    """Test ledgers on different files in one thread do not share a connection."""
+    memory_ledger = DatabaseLedger(db_file=':memory:')
+    file_ledger = DatabaseLedger(db_file=temp_db)
+    memory_ledger.append_entry({'timestamp': 1.0, 'node_id': 'Node_1', 'features': [], 'confidence': 0.5})
+
+    assert memory_ledger.count_entries() == 1
+    assert file_ledger.count_entries() == 0
+    memory_ledger.cleanup()
+
+
+def test_get_entries_by_id_range(temp_db):
+    """Test fetching an inclusive ID range in one query."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    for i in range(5):
+        ledger.append_entry({'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [], 'confidence': 0.5})
+
+    entries = ledger.get_entries_by_id_range(2, 4)
+    assert [e['id'] for e in entries] == [2, 3, 4]
+    assert ledger.get_entries_by_id_range(6, 10) == []
+
+    with pytest.raises(ValueError):
+        ledger.get_entries_by_id_range(3, 2)
+
+
+def test_append_entries(temp_db):
+    """Test bulk append stores every entry in one transaction and returns their IDs."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    ledger.append_entry({'timestamp': 0.0, 'node_id': 'Node_0', 'features': [], 'confidence': 0.5})
+
+    ids = ledger.append_entries(
+        {'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [i], 'confidence': 0.5}
+        for i in range(1, 4)
+    )
+
+    assert ids == [2, 3, 4]
+    assert [e['features'] for e in ledger.read_ledger()] == [[], [1], [2], [3]]
+    assert ledger.append_entries([]) == []
+
+    with pytest.raises(ValueError):
+        ledger.append_entries([
+            {'timestamp': 5.0, 'node_id': 'Node_5', 'features': [], 'confidence': 0.5},
+            {'timestamp': 6.0, 'node_id': 'Node_6', 'features': [], 'confidence': 2.0}
+        ])
+    assert ledger.count_entries() == 4
+
+
+def test_connection_pragmas(temp_db):
+    """Test pooled connections are memory-mapped, size the page cache and wait on locks."""
+    from src.core.database import get_db_connection
+    conn = get_db_connection(temp_db)
+
+    assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+def test_concurrent_reads_during_writes(temp_db):
+    """Test lock-free readers in other threads see a consistent, growing ledger."""
+    import threading
+    ledger = DatabaseLedger(db_file=temp_db)
+    ledger.append_entry({'timestamp': 0.0, 'node_id': 'Node_0', 'features': [], 'confidence': 0.5})
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(50):
+                entries = ledger.get_new_entries(0)
+                assert [e['id'] for e in entries] == list(range(1, len(entries) + 1))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(1, 20):
+        ledger.append_entry({'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [], 'confidence': 0.5})
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(ledger.read_ledger()) == 20
+
+
+def test_reads_json_text_features(temp_db):
+    """Test rows whose features were stored as JSON text stay readable and bad rows are skipped."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    new_id = ledger.append_entry({'timestamp': 1.0, 'node_id': 'Node_1', 'features': [{'packet_size': 500.0}], 'confidence': 0.5})
+
+    from src.core.database import get_db_connection
+    conn = get_db_connection(temp_db)
+    conn.execute(
+        "INSERT INTO ledger (timestamp, node_id, features, confidence) VALUES (?, ?, ?, ?)",
+        (2.0, 'Node_2', '[{"packet_size": 600.0}]', 0.5)
+    )
+    conn.commit()
+
+    entries = ledger.get_new_entries(0)
+    assert [e['features'] for e in entries] == [[{'packet_size': 500.0}], [{'packet_size': 600.0}]]
+    assert ledger.get_entry_by_id(new_id)['features'] == [{'packet_size': 500.0}]
+
+    # An undecodable row is skipped without losing the rest of the batch
+    conn.execute(
+        "INSERT INTO ledger (timestamp, node_id, features, confidence) VALUES (?, ?, ?, ?)",
+        (3.0, 'Node_3', '[{"packet_size"', 0.5)
+    )
+    conn.commit()
+    assert [e['node_id'] for e in ledger.get_new_entries(0)] == ['Node_1', 'Node_2']
+
+
+def test_read_ledger_refreshes_incrementally(temp_db):
+    """Test read_ledger picks up appends and returns a copy of its snapshot."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    ledger.append_entry({'timestamp': 1.0, 'node_id': 'Node_1', 'features': [], 'confidence': 0.5})
+
+    first = ledger.read_ledger()
+    first.clear()
+    ledger.append_entry({'timestamp': 2.0, 'node_id': 'Node_2', 'features': [], 'confidence': 0.6})
+
+    assert [e['id'] for e in ledger.read_ledger()] == [1, 2]
+    assert first == []
+
+
+def test_writes_share_one_writer_connection(temp_db):
+    """Test appends from several threads all go through the file's single writer."""
+    import threading
+    from src.core.database import get_db_writer
+    ledger = DatabaseLedger(db_file=temp_db)
+    ledger.append_entry({'timestamp': 0.0, 'node_id': 'Node_0', 'features': [], 'confidence': 0.5})
+    with get_db_writer(temp_db) as writer:
+        pass
+
+    def append(i):
+        ledger.append_entry({'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [], 'confidence': 0.5})
+
+    threads = [threading.Thread(target=append, args=(i,)) for i in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with get_db_writer(temp_db) as same_writer:
+        assert same_writer is writer
+    assert ledger.count_entries() == 9
+
+
+def test_append_entry_rejects_invalid_entries(temp_db):
+    """Test entries with missing keys or out-of-range values are rejected."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    valid = {'timestamp': 1.0, 'node_id': 'Node_1', 'features': [], 'confidence': 0.5}
+
+    for bad in (
+        {k: v for k, v in valid.items() if k != 'features'},
+        {**valid, 'node_id': '  '},
+        {**valid, 'timestamp': '1.0'},
+        {**valid, 'confidence': 1.5},
+    ):
+        with pytest.raises(ValueError):
+            ledger.append_entry(bad)
+    assert ledger.count_entries() == 0
+
+
+def test_write_retries_when_database_locked(temp_db):
+    """Test busy/locked write errors are retried and other errors are raised."""
+    import sqlite3
+    ledger = DatabaseLedger(db_file=temp_db)
+    attempts = []
+
+    def flaky_insert(conn):
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise sqlite3.OperationalError("database is locked")
+        return 42
+
+    assert ledger._write(flaky_insert) == 42
+    assert len(attempts) == 3
+
+    def always_locked(conn):
+        raise sqlite3.OperationalError("database is locked")
+
+    with pytest.raises(sqlite3.OperationalError):
+        ledger._write(always_locked)
+
+    attempts.clear()
+
+    def broken_sql(conn):
+        attempts.append(1)
+        raise sqlite3.OperationalError("no such table: missing")
+
+    with pytest.raises(sqlite3.OperationalError):
+        ledger._write(broken_sql)
+    assert len(attempts) == 1
+
+
+def test_subscribe_receives_committed_entries(temp_db):
+    """Test subscribers get each appended entry and stop after unsubscribing."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    feed = ledger.subscribe()
+
+    id1 = ledger.append_entry({'timestamp': 1.0, 'node_id': 'Node_1', 'features': [1], 'confidence': 0.5})
+    ids = ledger.append_entries([
+        {'timestamp': 2.0, 'node_id': 'Node_2', 'features': [2], 'confidence': 0.6},
+        {'timestamp': 3.0, 'node_id': 'Node_3', 'features': [3], 'confidence': 0.7},
+    ])
+    received = [feed.get_nowait() for _ in range(3)]
+    assert feed.empty()
+    assert [e['id'] for e in received] == [id1] + ids
+    assert received == ledger.get_new_entries(0)
+
+    ledger.unsubscribe(feed)
+    ledger.append_entry({'timestamp': 4.0, 'node_id': 'Node_4', 'features': [4], 'confidence': 0.8})
+    assert feed.empty()
+
+
+def test_iter_new_entries(temp_db):
+    """Test iter_new_entries pages through entries past the last seen ID."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    ids = ledger.append_entries(
+        {'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [i], 'confidence': 0.5}
+        for i in range(5)
+    )
+
+    assert [e['id'] for e in ledger.iter_new_entries(ids[1], batch_size=2)] == ids[2:]
+    assert list(ledger.iter_new_entries(0)) == ledger.get_new_entries(0)
+    with pytest.raises(ValueError):
+        next(ledger.iter_new_entries(0, batch_size=0))
+
+
+def test_suspended_iterator_holds_no_read_snapshot(temp_db):
+    """Test a paused iter_new_entries does not hide later appends on the same thread."""
+    ledger = DatabaseLedger(db_file=temp_db)
+    ledger.append_entries(
+        {'timestamp': float(i), 'node_id': f'Node_{i}', 'features': [i], 'confidence': 0.5}
+        for i in range(5)
+    )
+
+    entries = ledger.iter_new_entries(0, batch_size=2)
+    assert next(entries)['node_id'] == 'Node_0'
+    ledger.append_entry({'timestamp': 9.0, 'node_id': 'Node_9', 'features': [9], 'confidence': 0.5})
+    assert ledger.count_entries() == 6
+    assert [e['node_id'] for e in entries] == ['Node_1', 'Node_2', 'Node_3', 'Node_4', 'Node_9']
+
+
+def test_json_batch_decode_does_not_regroup_malformed_rows(temp_db, monkeypatch):
+    """Test malformed JSON text rows cannot merge into each other in a batched read."""
+    from src.core.database import ledger_manager
+    monkeypatch.setattr(ledger_manager, 'MSGPACK_AVAILABLE', False)
+    ledger = DatabaseLedger(db_file=temp_db)
+    ledger.append_entry({'timestamp': 1.0, 'node_id': 'Node_1', 'features': [{'packet_size': 500.0}], 'confidence': 0.5})
+
+    # Joined as one array these regroup into [1,2], 3, 4 and match the row count
+    from src.core.database import get_db_connection
+    conn = get_db_connection(temp_db)
+    conn.executemany(
+        "INSERT INTO ledger (timestamp, node_id, features, confidence) VALUES (?, ?, ?, ?)",
+        [(2.0, 'Node_2', '[1', 0.5), (3.0, 'Node_3', '2]', 0.5), (4.0, 'Node_4', '3,4', 0.5)]
+    )
+    conn.commit()
+
+    entries = ledger.get_new_entries(0)
+    assert [(e['node_id'], e['features']) for e in entries] == [('Node_1', [{'packet_size': 500.0}])]
@@ -43,6 +43,8 @@ simulation:
         
     finally:
         os.unlink(tmp_path)
+        if os.path.exists(tmp_path + '.cache'):
+            os.unlink(tmp_path + '.cache')
 
 if __name__ == '__main__':
     test_environment_override()
\ No newline at end of file
@@ -8,6 +8,7 @@ from src.core.simulation import Simulation
 from src.core.database import DatabaseLedger
 from src.core.agents import AnomalyAgent
 import ray
+import time
 
 @pytest.fixture
 def mock_ledger():
@@ -87,6 +88,22 @@ def test_simulation_resolve_consensus_no_consensus():
     
     m.assert_not_called()
 
+def test_simulation_agents_receive_pushed_entries(tmp_path):
+    """Test agents are subscribed to the ledger and unsubscribed on cleanup."""
+    model = Simulation(num_agents=3, seed=42, db_file=str(tmp_path / 'ledger.db'))
+    assert len(model.ledger._subscribers) == 3
+
+    entry_id = model.ledger.append_entry({
+        'timestamp': time.time(), 'node_id': 'Node_external',
+        'features': [{'packet_size': 100.0}], 'confidence': 0.9
+    })
+    for agent in model.node_agents:
+        with patch.object(agent, 'validate_signature', return_value=True):
+            assert agent.poll_and_validate() == [{'sig_id': entry_id, 'valid': True}]
+
+    model.cleanup()
+    assert model.ledger._subscribers == []
+
 def test_simulation_run():
     """Test running the simulation for steps."""
     model = Simulation(num_agents=1, seed=42)
@@ -118,7 +118,7 @@ def test_anomaly_agent_init(sample_agent, mock_ledger):
     assert agent.node_id.startswith("Node_")
     assert len(agent.recent_data) == 0
     assert agent.last_seen_id == 0
-    assert agent.local_blacklist_file == f"blacklist_{agent.node_id}.json"
+    assert agent.local_blacklist_file == f"blacklist_{agent.node_id}.jsonl"
     assert agent.ledger == mock_ledger
 
     # Test lazy loading of anomaly model
@@ -262,7 +262,7 @@ def test_update_model_and_blacklist(mock_model, mock_ledger):
                     agent.update_model_and_blacklist(sig)
         
         # Check file written
-        m_open.assert_called_with(agent.local_blacklist_file, 'w')
+        m_open.assert_called_with(agent.local_blacklist_file, 'a', encoding='utf-8')
     
     # Check model retrained
     train_data = np.array(agent.recent_data + [500]).reshape(-1, 1)
@@ -295,20 +295,20 @@ class TestAgentPerformance:
         assert agent._anomaly_model is not None
 
     def test_bounded_list_memory_efficiency(self, sample_agent):
-        """Test that BoundedList prevents memory leaks."""
+        """Test that the recent-data ring buffer prevents memory leaks."""
         agent = sample_agent
 
-        # Add many items to test memory bounds
-        for i in range(2000):
-            agent.recent_data.append(f"item_{i}")
+        # Generate more traffic than the buffer holds
+        for _ in range(20):
+            agent.generate_traffic(batch_size=100)
 
         # Should not exceed max_size (1000)
         assert len(agent.recent_data) <= 1000
 
-        # Should track total appended items
-        stats = agent.recent_data.get_stats()
-        assert stats['total_appended'] >= 2000
-        assert stats['current_size'] <= 1000
+        # Should keep exactly the newest 1000 values
+        last = agent.generate_traffic(batch_size=100)
+        assert len(agent.recent_data) == 1000
+        assert agent.recent_data[-100:] == last.tolist()
 
     def test_agent_factory_batch_creation(self, mock_model):
         """Test AgentFactory batch creation functionality."""